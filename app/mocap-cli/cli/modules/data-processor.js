@@ -1,3 +1,10 @@
+// Binary sensor frame after the "DATA:" prefix: little-endian uint16 sequence,
+// uint16 payload length, then w, x, y, z as int16 (1/16384 units) per sensor
+const DATA_PREFIX_LENGTH = 5;
+const DATA_HEADER_LENGTH = 4;
+const MAX_DATA_PAYLOAD = 1024;
+const QUAT_SCALE = 1 / 16384;
+
 /**
  * DataProcessor - Singleton for processing device data
  */
@@ -47,11 +54,36 @@ class DataProcessor {
 			// Begin parsing the buffer
 			let processedUpTo = 0;
 
-			// Process LOG messages
-			let logStart;
-			while ((logStart = this.dataBuffer.indexOf('LOG:', processedUpTo)) !== -1) {
+			// Process LOG messages and DATA frames in the order they arrive
+			while (true) {
+				const logStart = this.dataBuffer.indexOf('LOG:', processedUpTo);
+				const dataStart = this.dataBuffer.indexOf('DATA:', processedUpTo);
+				if (logStart === -1 && dataStart === -1) break;
+
+				if (dataStart !== -1 && (logStart === -1 || dataStart < logStart)) {
+					// Length-prefixed binary frame, wait until all of it has arrived
+					const headerEnd = dataStart + DATA_PREFIX_LENGTH + DATA_HEADER_LENGTH;
+					if (this.dataBuffer.length < headerEnd) break;
+
+					const payloadLength = this.dataBuffer.readUInt16LE(headerEnd - 2);
+					if (payloadLength > MAX_DATA_PAYLOAD) {
+						// Not a real frame header, skip the marker and resync
+						processedUpTo = dataStart + DATA_PREFIX_LENGTH;
+						continue;
+					}
+
+					const frameEnd = headerEnd + payloadLength;
+					if (this.dataBuffer.length < frameEnd) break;
+
+					// Extract the packet (header and payload)
+					const packet = this.dataBuffer.slice(dataStart + DATA_PREFIX_LENGTH, frameEnd);
+					this.handleDataPacket(packet);
+					processedUpTo = frameEnd;
+					continue;
+				}
+
 				// Find the end of the log message (newline)
-				let logEnd = this.dataBuffer.indexOf('\n', logStart);
+				const logEnd = this.dataBuffer.indexOf('\n', logStart);
 				if (logEnd === -1) {
 					// Incomplete message, wait for more data
 					break;
@@ -68,24 +100,6 @@ class DataProcessor {
 				processedUpTo = logEnd + 1;
 			}
 
-			// Process DATA messages
-			let dataStart;
-			while ((dataStart = this.dataBuffer.indexOf('DATA:', processedUpTo)) !== -1) {
-				// Find the next DATA: marker
-				const nextDataStart = this.dataBuffer.indexOf('DATA:', dataStart + 5);
-				if (nextDataStart === -1) {
-					// Incomplete packet, wait for more data
-					break;
-				}
-
-				// Extract the packet
-				const packet = this.dataBuffer.slice(dataStart + 5, nextDataStart);
-				this.handleDataPacket(packet);
-
-				// Move the position marker
-				processedUpTo = nextDataStart;
-			}
-
 			// Keep only unprocessed data
 			if (processedUpTo > 0) {
 				this.dataBuffer = this.dataBuffer.slice(processedUpTo);
@@ -143,7 +157,6 @@ class DataProcessor {
 	 */
 	handleDataPacket(packet) {
 		try {
-			const data = packet.toString();
 			const receivedTime = Date.now();
 
 			// Update streaming state
@@ -156,31 +169,26 @@ class DataProcessor {
 			this.packetCount++;
 			this.timestamps.push(receivedTime);
 
-			// Try to extract quaternion data
-			if (data.includes('SEQ:')) {
-				const seq = this.extractSequence(data);
-				if (seq !== null) {
-					// Check for lost packets
-					if (this.lastSeq !== null) {
-						const expectedSeq = (this.lastSeq + 1) % 65536;
-						if (seq !== expectedSeq) {
-							if (seq > expectedSeq) {
-								const missing = (seq - expectedSeq) % 65536;
-								if (missing < 1000) {
-									// Sanity check
-									this.missedPackets += missing;
-								}
-							} else {
-								this.outOfOrderPackets++;
-							}
+			// Check for lost packets
+			const seq = packet.readUInt16LE(0);
+			if (this.lastSeq !== null) {
+				const expectedSeq = (this.lastSeq + 1) % 65536;
+				if (seq !== expectedSeq) {
+					if (seq > expectedSeq) {
+						const missing = (seq - expectedSeq) % 65536;
+						if (missing < 1000) {
+							// Sanity check
+							this.missedPackets += missing;
 						}
+					} else {
+						this.outOfOrderPackets++;
 					}
-					this.lastSeq = seq;
 				}
-
-				// Extract sensor data
-				this.extractSensorData(data);
 			}
+			this.lastSeq = seq;
+
+			// Extract sensor data
+			this.extractSensorData(packet);
 
 			// Call data callback if exists
 			if (this.dataCallback) {
@@ -199,73 +207,24 @@ class DataProcessor {
 		}
 	}
 
-	/**
-	 * Extract sequence number from packet
-	 */
-	extractSequence(data) {
-		try {
-			const seqIndex = data.indexOf('SEQ:');
-			if (seqIndex === -1) return null;
-
-			const seqStart = seqIndex + 4;
-			const seqEnd = data.indexOf(',', seqStart);
-			if (seqEnd === -1) return null;
-
-			return parseInt(data.substring(seqStart, seqEnd), 10);
-		} catch (error) {
-			return null;
-		}
-	}
-
 	/**
 	 * Extract sensor data from packet
 	 */
-	extractSensorData(data) {
+	extractSensorData(packet) {
 		try {
 			// Clear old data
-			this.sensorData = {};
-
-			// Extract sequence number
-			const seqIndex = data.indexOf('SEQ:');
-			if (seqIndex !== -1) {
-				const seqStart = seqIndex + 4;
-				const seqEnd = data.indexOf(',', seqStart);
-				if (seqEnd !== -1) {
-					this.sensorData.sequence = parseInt(data.substring(seqStart, seqEnd), 10);
-				}
-			}
-
-			// Extract sensor readings with optimized parsing
-			let pos = 0;
-			while ((pos = data.indexOf('S', pos)) !== -1) {
-				// Skip if not a sensor identifier
-				if (pos + 1 >= data.length || !/\d/.test(data[pos + 1])) {
-					pos++;
-					continue;
-				}
-
-				// Extract sensor ID
-				const idEnd = data.indexOf(':', pos);
-				if (idEnd === -1) break;
-
-				const sensorId = data.substring(pos + 1, idEnd);
-
-				// Extract quaternion values
-				const valuesStart = data.indexOf('[', idEnd);
-				if (valuesStart === -1) break;
-
-				const valuesEnd = data.indexOf(']', valuesStart);
-				if (valuesEnd === -1) break;
-
-				// Parse values with optimized split
-				const valuesStr = data.substring(valuesStart + 1, valuesEnd);
-				const values = this.fastSplit(valuesStr).map((v) => parseFloat(v));
-
-				if (values.length === 4) {
-					this.sensorData[`S${sensorId}`] = values;
-				}
-
-				pos = valuesEnd + 1;
+			this.sensorData = { sequence: packet.readUInt16LE(0) };
+
+			// Each sensor is w, x, y, z as int16 in 1/16384 units
+			const sensorCount = packet.readUInt16LE(2) >> 3;
+			for (let i = 0; i < sensorCount; i++) {
+				const pos = DATA_HEADER_LENGTH + i * 8;
+				this.sensorData[`S${i}`] = [
+					packet.readInt16LE(pos) * QUAT_SCALE,
+					packet.readInt16LE(pos + 2) * QUAT_SCALE,
+					packet.readInt16LE(pos + 4) * QUAT_SCALE,
+					packet.readInt16LE(pos + 6) * QUAT_SCALE
+				];
 			}
 		} catch (error) {
 			if (this.logCallback) {
@@ -274,29 +233,6 @@ class DataProcessor {
 		}
 	}
 
-	/**
-	 * Fast string split for comma-separated values
-	 */
-	fastSplit(str) {
-		const result = [];
-		let start = 0;
-		let pos = 0;
-
-		while (pos < str.length) {
-			if (str[pos] === ',') {
-				result.push(str.substring(start, pos));
-				start = pos + 1;
-			}
-			pos++;
-		}
-
-		if (start < str.length) {
-			result.push(str.substring(start));
-		}
-
-		return result;
-	}
-
 	/**
 	 * Reset statistics
 	 */
@@ -17,8 +17,12 @@ export function setDebugLogging(enabled) {
 	console.log(`Debug logging ${enabled ? 'enabled' : 'disabled'}`);
 }
 
-// Buffer to collect partial QUAT_ messages
-let quatBuffer = '';
+// Binary sensor frame after the "DATA:" prefix: little-endian uint16 sequence,
+// uint16 payload length, then w, x, y, z as int16 (1/16384 units) per sensor
+const DATA_PREFIX_LENGTH = 5;
+const DATA_HEADER_LENGTH = 4;
+const MAX_DATA_PAYLOAD = 1024;
+const QUAT_SCALE = 1 / 16384;
 
 export async function connectToSerialPort(options) {
 	try {
@@ -143,51 +147,31 @@ function handleSerialChunk(chunk) {
 function processBuffer() {
 	let processedUpTo = 0;
 
-	// Process DATA: packets
+	// Handle DATA: frames and LOG: messages in the order they arrive
 	while (true) {
 		const dataStart = dataBuffer.indexOf('DATA:', processedUpTo);
-		if (dataStart === -1) break;
-
-		const nextDataStart = dataBuffer.indexOf('DATA:', dataStart + 5);
-		if (nextDataStart === -1) break;
+		const logStart = dataBuffer.indexOf('LOG:', processedUpTo);
+		if (dataStart === -1 && logStart === -1) break;
 
-		const packet = dataBuffer.slice(dataStart + 5, nextDataStart);
-		processSensorDataPacket(packet);
-		processedUpTo = nextDataStart;
-	}
+		if (dataStart !== -1 && (logStart === -1 || dataStart < logStart)) {
+			// Length-prefixed binary frame - wait until all of it has arrived
+			const headerEnd = dataStart + DATA_PREFIX_LENGTH + DATA_HEADER_LENGTH;
+			if (dataBuffer.length < headerEnd) break;
 
-	// Handle QUAT_ and SEQ: packets
-	if (processedUpTo === 0) {
-		const seqStart = dataBuffer.indexOf('SEQ:');
-		if (seqStart !== -1) {
-			const nextSeqStart = dataBuffer.indexOf('SEQ:', seqStart + 4);
-			if (nextSeqStart !== -1) {
-				const packet = dataBuffer.slice(seqStart, nextSeqStart);
-				processSensorDataPacket(packet);
-				processedUpTo = nextSeqStart;
+			const payloadLength = dataBuffer.readUInt16LE(headerEnd - 2);
+			if (payloadLength > MAX_DATA_PAYLOAD) {
+				// Not a real frame header - skip the marker and resync
+				processedUpTo = dataStart + DATA_PREFIX_LENGTH;
+				continue;
 			}
-		}
 
-		const quatStart = dataBuffer.indexOf('QUAT_');
-		if (quatStart !== -1 && (seqStart === -1 || quatStart < seqStart)) {
-			if (quatStart + 5 >= dataBuffer.length || dataBuffer.indexOf('SEQ:', quatStart) === -1) {
-				const packet = dataBuffer.slice(quatStart, quatStart + 5);
-				processSensorDataPacket(packet);
-				processedUpTo = quatStart + 5;
-			} else {
-				const nextQuat = dataBuffer.indexOf('QUAT_', quatStart + 5);
-				const endPos = nextQuat !== -1 ? nextQuat : dataBuffer.length;
-				const packet = dataBuffer.slice(quatStart, endPos);
-				processSensorDataPacket(packet);
-				processedUpTo = endPos;
-			}
-		}
-	}
+			const frameEnd = headerEnd + payloadLength;
+			if (dataBuffer.length < frameEnd) break;
 
-	// Process LOG: messages with improved multi-line handling
-	while (true) {
-		const logStart = dataBuffer.indexOf('LOG:', processedUpTo);
-		if (logStart === -1) break;
+			processSensorFrame(dataStart + DATA_PREFIX_LENGTH, payloadLength);
+			processedUpTo = frameEnd;
+			continue;
+		}
 
 		// Instead of looking for just any newline, we need to find where this log
 		// message truly ends - at the next LOG: or DATA: that starts a new line
@@ -255,157 +239,43 @@ function processBuffer() {
 	}
 }
 
-function processSensorDataPacket(packet) {
+/**
+ * Decode one binary sensor frame from dataBuffer and broadcast it
+ */
+function processSensorFrame(offset, payloadLength) {
 	try {
-		const data = packet.toString().trim();
-
-		if (!data) return;
-
-		if (data === 'QUAT_') {
-			quatBuffer = data;
-			return;
-		}
-
-		let processedData = data;
-		if (quatBuffer === 'QUAT_' && data.startsWith('SEQ:')) {
-			processedData = quatBuffer + data;
-			quatBuffer = '';
+		const sensorData = { sequence: dataBuffer.readUInt16LE(offset) };
+		const payloadStart = offset + DATA_HEADER_LENGTH;
+		const sensorCount = payloadLength >> 3;
+
+		for (let i = 0; i < sensorCount; i++) {
+			const pos = payloadStart + i * 8;
+			sensorData[`S${i}`] = [
+				dataBuffer.readInt16LE(pos) * QUAT_SCALE,
+				dataBuffer.readInt16LE(pos + 2) * QUAT_SCALE,
+				dataBuffer.readInt16LE(pos + 4) * QUAT_SCALE,
+				dataBuffer.readInt16LE(pos + 6) * QUAT_SCALE
+			];
 		}
 
-		if (processedData.includes('QUAT_DATA:') || processedData.includes('SEQ:')) {
-			const cleanData = extractQuatData(processedData);
-			if (cleanData) {
-				const sensorData = parseSensorData(cleanData);
-				const sensorCount = Object.keys(sensorData).filter((k) => k.startsWith('S')).length;
-
-				if (sensorCount > 0 || sensorData.sequence !== undefined) {
-					if (debugLogging && sensorData.sequence % 25 === 0) {
-						console.log(
-							`Broadcasting sensor data with ${sensorCount} sensors, seq: ${sensorData.sequence}`
-						);
-					}
-
-					broadcast({
-						type: 'sensorData',
-						data: {
-							timestamp: Date.now(),
-							sensorData: sensorData
-						}
-					});
-
-					return;
-				}
-			}
+		if (debugLogging && sensorData.sequence % 25 === 0) {
+			console.log(
+				`Broadcasting sensor data with ${sensorCount} sensors, seq: ${sensorData.sequence}`
+			);
 		}
 
-		if (processedData !== 'QUAT_' && !processedData.startsWith('SEQ:')) {
-			if (debugLogging) {
-				console.log(`Broadcasting unknown data: ${processedData.substring(0, 50)}...`);
+		broadcast({
+			type: 'sensorData',
+			data: {
+				timestamp: Date.now(),
+				sensorData: sensorData
 			}
-			broadcast({
-				type: 'log',
-				message: processedData
-			});
-		}
+		});
 	} catch (error) {
 		console.error('Error processing sensor packet:', error);
 	}
 }
 
-function extractQuatData(data) {
-	if (data.startsWith('QUAT_DATA:')) {
-		return data.substring('QUAT_DATA:'.length).trim();
-	} else if (data.indexOf('QUAT_DATA:') !== -1) {
-		const index = data.indexOf('QUAT_DATA:');
-		return data.substring(index + 'QUAT_DATA:'.length).trim();
-	} else if (data.startsWith('QUAT_SEQ:') || data.includes('SEQ:')) {
-		// Handle the split format or direct SEQ format
-		const seqIndex = data.indexOf('SEQ:');
-		if (seqIndex !== -1) {
-			return data.substring(seqIndex).trim();
-		}
-	}
-	return data;
-}
-
-function parseSensorData(data) {
-	const result = {};
-
-	try {
-		// Extract sequence number
-		if (data.includes('SEQ:')) {
-			const seqPart = data.substring(data.indexOf('SEQ:') + 4);
-			const seqEnd = seqPart.indexOf(',');
-			if (seqEnd > 0) {
-				result.sequence = parseInt(seqPart.substring(0, seqEnd), 10);
-			}
-		}
-
-		// Extract sensor data
-		let currentPos = 0;
-		while ((currentPos = data.indexOf('S', currentPos)) !== -1) {
-			if (currentPos + 1 >= data.length || !isDigit(data[currentPos + 1])) {
-				currentPos++;
-				continue;
-			}
-
-			const sensorIdEnd = data.indexOf(':', currentPos);
-			if (sensorIdEnd === -1) break;
-
-			const sensorId = data.substring(currentPos + 1, sensorIdEnd);
-
-			const valuesStart = data.indexOf('[', sensorIdEnd);
-			if (valuesStart === -1) break;
-
-			const valuesEnd = data.indexOf(']', valuesStart);
-			if (valuesEnd === -1) break;
-
-			const valuesStr = data.substring(valuesStart + 1, valuesEnd);
-			const values = fastSplit(valuesStr).map(parseFloat);
-
-			if (values.length === 4) {
-				result[`S${sensorId}`] = values;
-			}
-
-			currentPos = valuesEnd + 1;
-		}
-	} catch (error) {
-		console.error('Error parsing sensor data:', error);
-	}
-
-	return result;
-}
-
-/**
- * Check if character is a digit
- */
-function isDigit(char) {
-	return char >= '0' && char <= '9';
-}
-
-/**
- * Fast string split for comma-separated values
- */
-function fastSplit(str) {
-	const result = [];
-	let start = 0;
-	let pos = 0;
-
-	while (pos < str.length) {
-		if (str[pos] === ',') {
-			result.push(str.substring(start, pos));
-			start = pos + 1;
-		}
-		pos++;
-	}
-
-	if (start < str.length) {
-		result.push(str.substring(start));
-	}
-
-	return result;
-}
-
 async function checkForPortChange() {
 	if (!global.serialPort || !global.serialPort.isOpen || !global.originalPortPath) {
 		return null;
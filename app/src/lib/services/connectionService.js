@@ -10,12 +10,11 @@ import {
 	setOriginalPort,
 	serialPort,
 	sensorData,
-	lastDataTimestamp,
 	isStreaming
 } from '../stores/connectionStore.js';
 
 import { updateSensorData } from '../stores/motionStore.js';
-import { parseDataMessage, trackDataReception } from './dataService.js';
+import { trackDataReception } from './dataService.js';
 
 let socket = null;
 let animFrameId = null;
@@ -297,34 +296,6 @@ function processLogMessage(data) {
 	) {
 		setStreaming(false);
 	}
-
-	const now = Date.now();
-	let lastTimestamp = 0;
-
-	const unsubscribe = lastDataTimestamp.subscribe((value) => {
-		lastTimestamp = value;
-	});
-	unsubscribe();
-
-	const timeSinceLastData = now - lastTimestamp;
-
-	if (data.message.includes('QUAT_DATA:') && timeSinceLastData > 100) {
-		const parsedData = parseDataMessage(data.message);
-		if (parsedData) {
-			trackDataReception(parsedData);
-			setLastDataTimestamp(now);
-
-			sensorData.set(parsedData);
-			updateSensorData(parsedData);
-
-			console.log(
-				'Parsed QUAT_DATA from log:',
-				Object.keys(parsedData).filter((k) => k.startsWith('S')).length,
-				'sensors, sequence:',
-				parsedData.sequence
-			);
-		}
-	}
 }
 
 function handlePortChange(message) {
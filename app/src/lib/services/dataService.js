@@ -85,78 +85,6 @@ function checkSequence(sequence) {
 	lastSequence = sequence;
 }
 
-export function parseDataMessage(message) {
-	if (!message) return null;
-
-	try {
-		let dataStart = message.indexOf('QUAT_DATA:');
-		if (dataStart === -1) return null;
-
-		const prefix = 'QUAT_DATA:';
-		if (message.includes('DATA:QUAT_DATA:')) {
-			dataStart = message.indexOf('DATA:QUAT_DATA:') + 5; // Skip 'DATA:' prefix
-		}
-
-		const cleanMessage = message.substring(dataStart + prefix.length).trim();
-
-		const result = {};
-
-		if (cleanMessage.includes('SEQ:')) {
-			const seqPart = cleanMessage.substring(cleanMessage.indexOf('SEQ:') + 4);
-			const seqEnd = seqPart.indexOf(',');
-			if (seqEnd > 0) {
-				result.sequence = parseInt(seqPart.substring(0, seqEnd), 10);
-			}
-		}
-
-		let currentPos = 0;
-		while ((currentPos = cleanMessage.indexOf('S', currentPos)) !== -1) {
-			if (currentPos + 1 >= cleanMessage.length || !/\d/.test(cleanMessage[currentPos + 1])) {
-				currentPos++;
-				continue;
-			}
-
-			// Find format S0:[w,x,y,z]
-			const sensorIdEnd = cleanMessage.indexOf(':', currentPos);
-			if (sensorIdEnd === -1) break;
-
-			const sensorId = cleanMessage.substring(currentPos + 1, sensorIdEnd);
-
-			const valuesStart = cleanMessage.indexOf('[', sensorIdEnd);
-			if (valuesStart === -1) break;
-
-			const valuesEnd = cleanMessage.indexOf(']', valuesStart);
-			if (valuesEnd === -1) break;
-
-			const valuesStr = cleanMessage.substring(valuesStart + 1, valuesEnd);
-			const values = valuesStr.split(',').map((v) => parseFloat(v.trim()));
-
-			if (values.length === 4) {
-				// Store data with S prefix (S0, S1, etc.) to match expected format
-				result[`S${sensorId}`] = values;
-
-				// Enable to force debug log for the first 5 packets
-				if (result.sequence < 5) {
-					console.log(`Parsed sensor S${sensorId} data:`, values);
-				}
-			}
-
-			currentPos = valuesEnd + 1;
-		}
-
-		// Validate we have data before returning
-		const sensorCount = Object.keys(result).filter((k) => k.startsWith('S')).length;
-		if (sensorCount > 0 || result.sequence !== undefined) {
-			return result;
-		}
-
-		return null;
-	} catch (error) {
-		console.error('Error parsing data message:', error);
-		return null;
-	}
-}
-
 export function getPacketStats() {
 	return {
 		missedPackets,
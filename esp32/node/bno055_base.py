@@ -88,7 +88,8 @@ class BNO055_BASE:
         self.gravity = lambda : self.scaled_tuple(0x2e, 1/100)  # m.s^-2
         self.gyro = lambda : self.scaled_tuple(0x14, 1/16)  # deg.s^-1
         self.euler = lambda : self.scaled_tuple(0x1a, 1/16)  # degrees (heading, roll, pitch)
-        self.quaternion = lambda : self.scaled_tuple(0x20, 1/(1<<14), bytearray(8), '<hhhh')  # (w, x, y, z)
+        qbuf = bytearray(8)  # Allocated once, not on every quaternion() call
+        self.quaternion = lambda : self.scaled_tuple(0x20, 1/(1<<14), qbuf, '<hhhh')  # (w, x, y, z)
         self._mode = _CONFIG_MODE
         try:
             chip_id = self._read(_ID_REGISTER)
@@ -155,32 +156,9 @@ class BNO055_BASE:
             Therefore the last byte must be written whenever the user wants to
             changes the configuration.'''
 
-        self._write(ACCEL_OFFSET_X_LSB_ADDR, buf[0])
-        self._write(ACCEL_OFFSET_X_MSB_ADDR, buf[1])
-        self._write(ACCEL_OFFSET_Y_LSB_ADDR, buf[2])
-        self._write(ACCEL_OFFSET_Y_MSB_ADDR, buf[3])
-        self._write(ACCEL_OFFSET_Z_LSB_ADDR, buf[4])
-        self._write(ACCEL_OFFSET_Z_MSB_ADDR, buf[5])
-
-        self._write(MAG_OFFSET_X_LSB_ADDR, buf[6])
-        self._write(MAG_OFFSET_X_MSB_ADDR, buf[7])
-        self._write(MAG_OFFSET_Y_LSB_ADDR, buf[8])
-        self._write(MAG_OFFSET_Y_MSB_ADDR, buf[9])
-        self._write(MAG_OFFSET_Z_LSB_ADDR, buf[10])
-        self._write(MAG_OFFSET_Z_MSB_ADDR, buf[11])
-
-        self._write(GYRO_OFFSET_X_LSB_ADDR, buf[12])
-        self._write(GYRO_OFFSET_X_MSB_ADDR, buf[13])
-        self._write(GYRO_OFFSET_Y_LSB_ADDR, buf[14])
-        self._write(GYRO_OFFSET_Y_MSB_ADDR, buf[15])
-        self._write(GYRO_OFFSET_Z_LSB_ADDR, buf[16])
-        self._write(GYRO_OFFSET_Z_MSB_ADDR, buf[17])
-
-        self._write(ACCEL_RADIUS_LSB_ADDR, buf[18])
-        self._write(ACCEL_RADIUS_MSB_ADDR, buf[19])
-
-        self._write(MAG_RADIUS_LSB_ADDR, buf[20])
-        self._write(MAG_RADIUS_MSB_ADDR, buf[21])
+        # The 22 offset/radius registers are contiguous (0x55-0x6A) and each pair
+        # is written LSB then MSB, so one auto-incrementing burst covers them all.
+        self._i2c.writeto_mem(self.address, ACCEL_OFFSET_X_LSB_ADDR, bytes(buf[:22]))
 
         self.mode(lastMode)
 
@@ -5,6 +5,7 @@ NODE_IP = "192.168.4.2"
 RECEIVER_IP = "192.168.4.1"
 SUBNET_MASK = "255.255.255.0"
 GATEWAY = "192.168.4.1"
+WIFI_RECONNECTS = 5  # Reconnect attempts the WiFi driver makes on its own after a drop
 
 # Ports
 TCP_PORT = 5006
@@ -13,7 +14,18 @@ UDP_PORT = 5005
 # Hardware
 SDA_PIN = 5
 SCL_PIN = 6
+I2C_ID = 1  # Hardware I2C peripheral (SoftI2C is far slower per byte)
+I2C_FREQ = 400000  # Fast mode, the BNO055 and TCA9548A maximum
 MUX_ADDR = 0x70
 
-# Hardware timing
-MUX_SWITCH_DELAY_MS = 1
+# Hardware timing (0 = no settle delay after a multiplexer channel switch)
+MUX_SWITCH_DELAY_MS = 0
+
+# Target sensor streaming rate
+SAMPLE_RATE_HZ = 66
+
+# Hardware timer that paces streaming frames (None = pace with sleep_ms deadlines)
+FRAME_TIMER_ID = 0
+
+# Send sensor data as "SEQ:n,S0:[w,x,y,z],..." text instead of binary packets
+DEBUG_TEXT_PACKET = False
@@ -6,7 +6,10 @@ import _thread
 import struct
 import sys
 import gc
-from bno055 import BNO055
+import errno
+import select
+from micropython import const
+from bno055 import BNO055, QUAT_DATA
 import config_node as cfg
 
 # Global flag and lock to control sensor reading thread
@@ -16,11 +19,28 @@ reading_lock = _thread.allocate_lock()
 # Global list to hold sensor objects (one per multiplexer channel)
 sensors = [None] * 8
 sensor_lock = _thread.allocate_lock()
+_SNAP = [None] * 8  # Per-frame copy of sensors taken by the reading thread
+active_sensor_count = 0  # Number of non-None entries in sensors (guarded by sensor_lock)
 
-# Global TCP socket for sending logs to receiver
+# Global TCP socket for sending logs to receiver. It is non-blocking, so
+# receiver_tx_poll (registered for POLLOUT) waits for send buffer space.
 receiver_tcp = None
+receiver_tx_poll = None
 tcp_lock = _thread.allocate_lock()
 
+# Pending log lines and heartbeats for the receiver, sent in one TCP write per
+# flush (guarded by tcp_lock). Bytes the socket doesn't take stay queued, so a
+# full send buffer never cuts a message in half.
+LOG_BUF_SIZE = const(1024)
+LOG_FLUSH_INTERVAL_MS = const(50)
+LOG_SEND_TIMEOUT_MS = const(20)  # Longest a flush waits for send buffer space
+LOG_PREFIX = b"LOG:"
+LOG_LINE_OVERHEAD = const(5)  # "LOG:" prefix plus trailing newline
+log_buf = bytearray(LOG_BUF_SIZE)
+log_buf_len = 0
+log_dropped = 0  # Lines dropped while the buffer was full, reported once it drains
+last_log_flush = 0
+
 # Emergency stop flag
 emergency_stop = False
 emergency_lock = _thread.allocate_lock()
@@ -32,13 +52,60 @@ try:
 except Exception as e:
     print(f"Warning: Could not initialize watchdog: {e}")
 
-# Pre-allocate data buffers for sensor readings to reduce memory fragmentation
-sensor_data_buffer = [0.0] * 32
+# Let the heap trigger collection by allocation volume instead of fixed intervals;
+# no thread calls gc.collect() on a timer
+try:
+    gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+except Exception as e:
+    print(f"Warning: Could not set GC threshold: {e}")
+
+# Scale from the BNO055's raw int16 quaternion units to unit quaternion values
+_QUAT_SCALE = 1.0 / 16384.0
+
+# Per-sensor lookup tables: I2C address (even indices at 0x28, odd at 0x29)
+# and multiplexer channel (two sensors per channel)
+_SENSOR_ADDR = bytes((0x28, 0x29, 0x28, 0x29, 0x28, 0x29, 0x28, 0x29))
+_SENSOR_CHANNEL = bytes((0, 0, 1, 1, 2, 2, 3, 3))
+
+# Multiplexer control bytes, built once instead of per call: one select mask
+# per channel in use (0-3) and the all-channels-off value used for resets
+_MUX_SELECT = tuple(bytes((1 << ch,)) for ch in range(4))
+_MUX_DISABLE = b"\x00"
+
+# Channel the multiplexer was last switched to (-1 = unknown, forces a write)
+mux_channel = -1
+
+# Binary UDP packet: little-endian header (uint16 sequence number, uint16
+# payload length) followed by the raw quaternion registers (w, x, y, z as
+# little-endian int16) of each of the 8 sensors. At 68 bytes it always fits
+# in a single lwIP pbuf / WiFi frame.
+_PKT_HEADER_SIZE = const(4)
+_PKT_PAYLOAD_SIZE = const(8 * 8)
+_PKT = bytearray(_PKT_HEADER_SIZE + _PKT_PAYLOAD_SIZE)
+struct.pack_into('<HH', _PKT, 0, 0, _PKT_PAYLOAD_SIZE)
+
+# Per-sensor windows into the packet payload, so the I2C reads land in place
+_PKT_QUAT = tuple(memoryview(_PKT)[_PKT_HEADER_SIZE + i * 8:_PKT_HEADER_SIZE + 8 + i * 8] for i in range(8))
+
+# Fixed protocol messages, encoded once
+_CONNECTED_MSG = b"NODE_CONNECTED:v1.0\n"  # Newline-terminated like LOG: lines
+_RESTART_RESP = b"OK:Restarting node..."
+_OK_PREFIX = b"OK:"
+_ERR_PREFIX = b"ERROR:"
+
+# Binary heartbeat, assembled in the pending buffer: b"H" followed by uint8
+# active sensors, uint8 total sensors, uint16 free memory in KB and a reserved byte
+_HB_FORMAT = '<BBHB'
+_HB_SIZE = const(6)
+
+def create_i2c():
+    """Create the hardware I2C peripheral on the configured pins and bus speed"""
+    return machine.I2C(cfg.I2C_ID, sda=machine.Pin(cfg.SDA_PIN), scl=machine.Pin(cfg.SCL_PIN), freq=cfg.I2C_FREQ)
 
 # Create an I2C bus using the configured SDA and SCL pins
 try:
-    print(f"Creating I2C bus on pins SDA={cfg.SDA_PIN}, SCL={cfg.SCL_PIN}")
-    i2c = machine.I2C(1, sda=machine.Pin(cfg.SDA_PIN), scl=machine.Pin(cfg.SCL_PIN), freq=400000)  # Increased frequency
+    print(f"Creating I2C bus on pins SDA={cfg.SDA_PIN}, SCL={cfg.SCL_PIN}, {cfg.I2C_FREQ} Hz")
+    i2c = create_i2c()
 except Exception as e:
     print(f"Error creating I2C bus: {e}")
     machine.reset()
@@ -56,14 +123,21 @@ SENSOR_NAMES = [
 ]
 
 # Log levels for better filtering
-LOG_DEBUG = 0
-LOG_INFO = 1
-LOG_WARNING = 2
-LOG_ERROR = 3
+LOG_DEBUG = const(0)
+LOG_INFO = const(1)
+LOG_WARNING = const(2)
+LOG_ERROR = const(3)
 
 # Current log level
 current_log_level = LOG_INFO
 
+# Log line prefix for each level, indexed by level
+LOG_LEVEL_PREFIXES = ("[DEBUG] ", "", "[WARNING] ", "[ERROR] ")
+
+# Timestamp prefix cache: rebuilt only when the wall-clock second changes
+_ts_cache_sec = -1
+_ts_cache_str = ""
+
 def feed_watchdog():
     """Feed the watchdog timer if it's enabled"""
     global watchdog
@@ -73,6 +147,45 @@ def feed_watchdog():
         except Exception:
             pass
 
+def sleep_feed(ms):
+    """Sleep for ms milliseconds, feeding the watchdog at least once a second and stopping early on emergency stop"""
+    deadline = time.ticks_add(time.ticks_ms(), ms)
+    while not check_emergency_stop():
+        remaining = time.ticks_diff(deadline, time.ticks_ms())
+        if remaining <= 0:
+            break
+        time.sleep_ms(min(1000, remaining))
+        feed_watchdog()
+
+def set_sensor_locked(idx, sensor):
+    """Store a sensor slot and keep active_sensor_count in step (caller holds sensor_lock)"""
+    global active_sensor_count
+    if sensors[idx] is not None:
+        active_sensor_count -= 1
+    if sensor is not None:
+        active_sensor_count += 1
+    sensors[idx] = sensor
+
+def send_heartbeat(active_sensors, free_mem):
+    """
+    Queue a heartbeat behind any pending log lines and send them.
+    Returns False if there was no room for it yet; raises OSError if the
+    connection failed.
+    """
+    global log_buf_len
+    with tcp_lock:
+        if log_buf_len + _HB_SIZE > LOG_BUF_SIZE:
+            _flush_logs_locked()
+            if log_buf_len + _HB_SIZE > LOG_BUF_SIZE:
+                return False
+        pos = log_buf_len
+        log_buf[pos] = 0x48  # 'H'
+        struct.pack_into(_HB_FORMAT, log_buf, pos + 1, active_sensors, 8, min(free_mem >> 10, 0xFFFF), 0)
+        log_buf_len = pos + _HB_SIZE
+        if not _flush_logs_locked():
+            raise OSError("Heartbeat send failed")
+    return True
+
 def log(message, level=LOG_INFO):
     """Send log messages to receiver via TCP with log levels"""
     global current_log_level
@@ -81,34 +194,113 @@ def log(message, level=LOG_INFO):
     if level < current_log_level:
         return
         
-    # Get log level prefix
-    level_prefix = ""
-    if level == LOG_DEBUG:
-        level_prefix = "[DEBUG] "
-    elif level == LOG_WARNING:
-        level_prefix = "[WARNING] "
-    elif level == LOG_ERROR:
-        level_prefix = "[ERROR] "
-    
+    # Reuse the timestamp prefix while we are in the same second
+    global _ts_cache_sec, _ts_cache_str
     try:
-        t = time.localtime()
-        timestamp = "[{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}] ".format(t[0], t[1], t[2], t[3], t[4], t[5])
+        now = time.time()
+        if now != _ts_cache_sec:
+            t = time.localtime(now)
+            _ts_cache_str = "[{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}] ".format(t[0], t[1], t[2], t[3], t[4], t[5])
+            _ts_cache_sec = now
+        timestamp = _ts_cache_str
     except Exception:
         timestamp = ""
     
-    formatted = "[NODE] " + timestamp + level_prefix + message
+    formatted = "[NODE] " + timestamp + LOG_LEVEL_PREFIXES[level] + message
     
     # Print locally
     print(formatted)
     
-    # Send to receiver if connected
-    global receiver_tcp
+    # Queue for the receiver if connected; each line is newline-terminated so
+    # several lines can share one TCP write
+    global receiver_tcp, log_buf_len, log_dropped
     with tcp_lock:
         if receiver_tcp:
-            try:
-                receiver_tcp.send(("LOG:" + formatted).encode())
-            except Exception as e:
-                print("Failed to send log to receiver:", e)
+            # Copy "LOG:" + message + "\n" straight into the pending buffer, so the
+            # only allocation is the encoded message; overlong lines are truncated
+            body = formatted.encode()
+            # The receiver frames on newlines and reads a line starting with "H"
+            # as a binary heartbeat, so a message must stay on one LOG: line
+            if b"\n" in body:
+                body = body.replace(b"\n", b" | ")
+            n = min(len(body), LOG_BUF_SIZE - LOG_LINE_OVERHEAD)
+            if log_buf_len + n + LOG_LINE_OVERHEAD > LOG_BUF_SIZE:
+                _flush_logs_locked()
+                if log_buf_len + n + LOG_LINE_OVERHEAD > LOG_BUF_SIZE:
+                    # The receiver isn't draining; drop this line rather than wait
+                    log_dropped += 1
+                    return
+            pos = log_buf_len
+            log_buf[pos:pos + 4] = LOG_PREFIX
+            log_buf[pos + 4:pos + 4 + n] = body if n == len(body) else memoryview(body)[:n]
+            log_buf[pos + 4 + n] = 0x0A  # '\n'
+            log_buf_len = pos + n + LOG_LINE_OVERHEAD
+            if time.ticks_diff(time.ticks_ms(), last_log_flush) >= LOG_FLUSH_INTERVAL_MS:
+                _flush_logs_locked()
+
+def send_some(sock, tx_poll, data, timeout_ms):
+    """
+    Send data on a non-blocking socket, waiting on tx_poll (POLLOUT) while its
+    send buffer is full. Returns the number of bytes sent, which is short of
+    len(data) only if timeout_ms ran out; other socket errors are raised.
+    """
+    mv = memoryview(data)
+    total = len(mv)
+    sent = 0
+    deadline = time.ticks_add(time.ticks_ms(), timeout_ms)
+    while sent < total:
+        try:
+            n = sock.send(mv[sent:])
+        except OSError as e:
+            if e.args[0] != errno.EAGAIN:
+                raise
+            n = 0
+        if n:
+            sent += n
+            continue
+        remaining = time.ticks_diff(deadline, time.ticks_ms())
+        if remaining <= 0:
+            break
+        tx_poll.poll(remaining)
+    return sent
+
+def _flush_logs_locked():
+    """
+    Send the pending bytes in one write; caller must hold tcp_lock.
+    Whatever the socket doesn't take in time stays queued for the next flush.
+    Returns False if the connection failed.
+    """
+    global log_buf_len, log_dropped, last_log_flush
+    ok = True
+    if log_buf_len and receiver_tcp:
+        try:
+            sent = send_some(receiver_tcp, receiver_tx_poll, memoryview(log_buf)[:log_buf_len], LOG_SEND_TIMEOUT_MS)
+        except Exception as e:
+            print("Failed to send log to receiver:", e)
+            sent = log_buf_len
+            ok = False
+        if sent < log_buf_len:
+            # Keep the unsent tail at the front; it goes out before anything newer.
+            # Copied through bytes since the ranges overlap (rare path)
+            log_buf[:log_buf_len - sent] = bytes(memoryview(log_buf)[sent:log_buf_len])
+        log_buf_len -= sent
+    elif not receiver_tcp:
+        log_buf_len = 0
+    if log_dropped and not log_buf_len:
+        print("Log buffer full,", log_dropped, "lines not sent to receiver")
+        log_dropped = 0
+    last_log_flush = time.ticks_ms()
+    return ok
+
+def flush_logs():
+    """Send any pending log lines to the receiver"""
+    with tcp_lock:
+        _flush_logs_locked()
+
+def log_if(level, fmt, *args):
+    """Format and log a message only if its level passes the current filter"""
+    if level >= current_log_level:
+        log(fmt.format(*args), level)
 
 def connect_wifi():
     """Connect to the receiver's WiFi access point in station mode using static IP with improved reliability."""
@@ -117,6 +309,12 @@ def connect_wifi():
     time.sleep_ms(500)  # Reduced sleep time
     sta.active(True)
     
+    # Bound the driver's own reconnect attempts so they don't stall the stack
+    try:
+        sta.config(reconnects=cfg.WIFI_RECONNECTS)
+    except Exception as e:
+        log_if(LOG_DEBUG, "Could not limit WiFi reconnects: {}", e)
+    
     # FIX: Set static IP configuration BEFORE connection attempt
     try:
         sta.ifconfig((cfg.NODE_IP, cfg.SUBNET_MASK, cfg.GATEWAY, cfg.GATEWAY))
@@ -131,11 +329,13 @@ def connect_wifi():
             sta.connect(cfg.SSID, cfg.PASSWORD)
             
             # Wait for connection with timeout and feed watchdog during wait
-            timeout = 15  # Increased timeout
-            while not sta.isconnected() and timeout > 0:
-                log(f"Waiting for WiFi connection... ({timeout}s remaining)", LOG_DEBUG)
-                time.sleep_ms(500)
-                timeout -= 0.5
+            deadline = time.ticks_add(time.ticks_ms(), 15000)  # Increased timeout
+            while not sta.isconnected():
+                remaining = time.ticks_diff(deadline, time.ticks_ms())
+                if remaining <= 0:
+                    break
+                log_if(LOG_DEBUG, "Waiting for WiFi connection... ({}s remaining)", remaining // 1000)
+                time.sleep_ms(min(500, remaining))
                 feed_watchdog()
                 
             if sta.isconnected():
@@ -152,8 +352,7 @@ def connect_wifi():
             # Progressive backoff before next attempt
             backoff = min(2**attempt, 30)  # Exponential backoff with 30s max
             log(f"Connection failed, retrying in {backoff}s...", LOG_WARNING)
-            time.sleep(backoff)
-            feed_watchdog()
+            sleep_feed(backoff * 1000)
             
         except Exception as e:
             log(f"WiFi connection error: {e}", LOG_ERROR)
@@ -164,11 +363,16 @@ def connect_wifi():
 
 def receiver_connection_thread():
     """Maintains connection to the receiver and handles reconnection with improved reliability."""
-    global receiver_tcp
+    global receiver_tcp, receiver_tx_poll, log_buf_len
     
     # More responsive heartbeat
     heartbeat_interval = 15  # seconds
-    reconnect_interval = 2  # seconds
+    reconnect_interval_ms = 2000
+    
+    # Free memory is informational only, so refresh it every few heartbeats
+    mem_refresh_every = 4
+    heartbeat_count = 0
+    free_mem = gc.mem_free()
     
     while not check_emergency_stop():
         try:
@@ -178,8 +382,25 @@ def receiver_connection_thread():
             client_sock.connect((cfg.RECEIVER_IP, cfg.TCP_PORT))
             log(f"Connected to receiver at {cfg.RECEIVER_IP}:{cfg.TCP_PORT}")
             
-            # FIX: Set timeout once when establishing connection rather than on every log call
-            client_sock.settimeout(0.5)  # Set a reasonable timeout for all operations
+            # Logs and heartbeats are small writes - send them without Nagle delay
+            try:
+                client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except Exception:
+                # Not all MicroPython ports expose TCP_NODELAY
+                pass
+            
+            # Non-blocking from here on: a full send buffer makes senders wait on
+            # POLLOUT for a bounded time instead of stalling, and poll() paces
+            # the loop below
+            client_sock.setblocking(False)
+            poller = select.poll()
+            poller.register(client_sock, select.POLLIN)
+            tx_poll = select.poll()
+            tx_poll.register(client_sock, select.POLLOUT)
+            
+            # Send initial message with protocol version, before any log line
+            if send_some(client_sock, tx_poll, _CONNECTED_MSG, 5000) < len(_CONNECTED_MSG):
+                raise OSError("Timed out sending connect message")
             
             # Store the connection
             with tcp_lock:
@@ -190,9 +411,9 @@ def receiver_connection_thread():
                     except Exception:
                         pass
                 receiver_tcp = client_sock
-            
-            # Send initial message with protocol version
-            client_sock.send("NODE_CONNECTED:v1.0".encode())
+                receiver_tx_poll = tx_poll
+                # Anything still queued was meant for the old connection
+                log_buf_len = 0
             
             # Loop to keep connection alive with more responsive health monitoring
             last_heartbeat = time.ticks_ms()
@@ -205,19 +426,31 @@ def receiver_connection_thread():
                 if time.ticks_diff(current_time, last_heartbeat) >= heartbeat_interval * 1000:
                     try:
                         # Include basic health info in heartbeat
-                        with sensor_lock:
-                            active_sensors = sum(1 for s in sensors if s is not None)
+                        active_sensors = active_sensor_count  # Single int read, no lock needed
+                        
+                        heartbeat_count += 1
+                        if heartbeat_count >= mem_refresh_every:
+                            heartbeat_count = 0
+                            free_mem = gc.mem_free()
                         
-                        heartbeat_msg = f"HEARTBEAT:{active_sensors}/8:{gc.mem_free()}"
-                        client_sock.send(heartbeat_msg.encode())
-                        last_heartbeat = current_time
-                        log(f"Sent heartbeat: {heartbeat_msg}", LOG_DEBUG)
+                        # Queued behind pending log lines, so it never splits one;
+                        # with no room yet it is retried on the next pass
+                        if send_heartbeat(active_sensors, free_mem):
+                            last_heartbeat = current_time
+                            log_if(LOG_DEBUG, "Sent heartbeat: {}/8:{}", active_sensors, free_mem)
                     except Exception as e:
                         log(f"Error sending heartbeat: {e}", LOG_ERROR)
                         break  # Connection likely lost, exit loop to reconnect
                 
-                # Sleep a bit to avoid busy waiting
-                time.sleep_ms(100)  # More frequent checks
+                # Push out any log lines queued since the last pass
+                flush_logs()
+                
+                # Wait up to 100 ms; wakes early if the receiver drops the connection
+                for _, event in poller.poll(100):
+                    if event & (select.POLLHUP | select.POLLERR):
+                        raise OSError("Receiver connection lost")
+                    if event & select.POLLIN and not client_sock.recv(64):
+                        raise OSError("Receiver closed the connection")
                 
         except Exception as e:
             log(f"Receiver connection error: {e}", LOG_WARNING)
@@ -230,18 +463,12 @@ def receiver_connection_thread():
                 pass
             
             # Wait before reconnection attempt with watchdog feeding
-            remaining = reconnect_interval
-            while remaining > 0 and not check_emergency_stop():
-                time.sleep_ms(100)
-                remaining -= 0.1
-                feed_watchdog()
+            sleep_feed(reconnect_interval_ms)
 
 def check_emergency_stop():
     """Check if emergency stop is activated"""
-    global emergency_stop
-    
-    with emergency_lock:
-        return emergency_stop
+    # A single global read is atomic; emergency_lock only guards writers
+    return emergency_stop
 
 def select_sensor(channel, retry=True):
     """
@@ -249,21 +476,29 @@ def select_sensor(channel, retry=True):
     Optimized for performance while maintaining reliability.
     Returns True if successful, False otherwise.
     """
-    global i2c
+    global i2c, mux_channel
+    
+    # Both sensors of a pair share a channel - skip the bus write if it is already selected
+    if channel == mux_channel:
+        return True
     
+    data = _MUX_SELECT[channel]
+    mux_channel = -1
     try:
-        data = bytes([1 << channel])
         i2c.writeto(cfg.MUX_ADDR, data)
-        time.sleep_ms(cfg.MUX_SWITCH_DELAY_MS)  # Use configured delay
+        # The TCA9548A switches on the STOP condition; a delay of 0 relies on the
+        # START latency of the next transaction instead of sleeping
+        if cfg.MUX_SWITCH_DELAY_MS > 0:
+            time.sleep_ms(cfg.MUX_SWITCH_DELAY_MS)
+        mux_channel = channel
         return True
     except Exception as e:
         if retry:
             try:
                 # One quick retry before giving up
                 time.sleep_ms(10)
-                # Need to redefine data inside retry block
-                data = bytes([1 << channel])
                 i2c.writeto(cfg.MUX_ADDR, data)
+                mux_channel = channel
                 return True
             except Exception:
                 log(f"Error switching multiplexer to channel {channel}: {e}", LOG_ERROR)
@@ -279,8 +514,7 @@ def save_calibration(sensor, idx):
         
     try:
         # Check if the sensor is calibrated enough to be worth saving
-        cal = sensor.cal_status()
-        if cal < 50:  # Only save if reasonably calibrated
+        if not sensor.calibrated():
             return False
             
         # Get the calibration data
@@ -288,13 +522,13 @@ def save_calibration(sensor, idx):
         # For illustrative purposes only
         try:
             cal_data = sensor.get_calibration()
-            log(f"Saved calibration for sensor {idx}", LOG_DEBUG)
+            log_if(LOG_DEBUG, "Saved calibration for sensor {}", idx)
             return True
         except AttributeError:
             # If get_calibration isn't available in the BNO055 implementation
             return False
     except Exception as e:
-        log(f"Error saving calibration for sensor {idx}: {e}", LOG_DEBUG)
+        log_if(LOG_DEBUG, "Error saving calibration for sensor {}: {}", idx, e)
         return False
 
 def load_calibration(sensor, idx):
@@ -308,24 +542,68 @@ def load_calibration(sensor, idx):
         try:
             # Simulated load calibration
             # sensor.set_calibration(stored_data)
-            log(f"Loaded calibration for sensor {idx}", LOG_DEBUG)
+            log_if(LOG_DEBUG, "Loaded calibration for sensor {}", idx)
             return True
         except AttributeError:
             # If set_calibration isn't available in the BNO055 implementation
             return False
     except Exception as e:
-        log(f"Error loading calibration for sensor {idx}: {e}", LOG_DEBUG)
+        log_if(LOG_DEBUG, "Error loading calibration for sensor {}: {}", idx, e)
         return False
 
+def _read_quats(i2c, select, snap, addrs, slots):
+    """Read all 8 sensors' raw quaternions into slots; returns a bitmask of failed sensors"""
+    # Bytecode fallback for quat_reader.read_quats; keep the two in step
+    failed = 0
+    for channel in range(4):
+        # Only switch the multiplexer for channels with a live sensor
+        if snap[channel * 2] is not None or snap[channel * 2 + 1] is not None:
+            select(channel)
+        for sub in range(2):
+            idx = channel * 2 + sub
+            slot = slots[idx]
+            if snap[idx] is not None:
+                try:
+                    # One burst read of the quaternion registers straight into
+                    # the packet, bypassing the driver's tuple building
+                    i2c.readfrom_mem_into(addrs[idx], QUAT_DATA, slot)
+                    continue
+                except Exception:
+                    failed |= 1 << idx
+            
+            # Sensor not available or read failed - use zeros
+            for k in range(8):
+                slot[k] = 0
+    return failed
+
+# The native-compiled read loop lives in its own module so a firmware without
+# the native emitter can still import this file
+try:
+    from quat_reader import read_quats
+except (ImportError, SyntaxError, ValueError) as e:
+    print(f"Warning: Native sensor read unavailable, using Python fallback: {e}")
+    read_quats = _read_quats
+
+# Calibration persistence depends on the BNO055 driver; when it lacks the
+# methods, replace the helpers with no-ops once instead of failing per call
+
+CAN_SAVE_CALIBRATION = hasattr(BNO055, 'get_calibration')
+CAN_LOAD_CALIBRATION = hasattr(BNO055, 'set_calibration')
+if not CAN_SAVE_CALIBRATION:
+    save_calibration = lambda sensor, idx: False
+if not CAN_LOAD_CALIBRATION:
+    load_calibration = lambda sensor, idx: False
+
 def init_sensors():
     """
     Initialize eight BNO055 sensors with improved error handling and recovery.
     Returns: True if at least one sensor initialized successfully
     """
-    global sensors, i2c
+    global sensors, i2c, active_sensor_count
     
     with sensor_lock:
         sensors = [None] * 8  # 8 sensors
+        active_sensor_count = 0
     success_count = 0
     
     # First reset the multiplexer to ensure a clean start
@@ -333,8 +611,8 @@ def init_sensors():
     
     # Try to initialize each sensor with progressive backoff
     for idx in range(8):
-        channel = idx // 2  # 0-3 channels
-        addr = 0x28 if (idx % 2 == 0) else 0x29
+        channel = _SENSOR_CHANNEL[idx]  # 0-3 channels
+        addr = _SENSOR_ADDR[idx]
         
         # Select the channel with error handling
         if not select_sensor(channel):
@@ -356,7 +634,7 @@ def init_sensors():
                 log(f"Sensor {idx} ({SENSOR_NAMES[idx]}, ch {channel}, addr {hex(addr)}) initialized", LOG_INFO)
                 success_count += 1
                 with sensor_lock:
-                    sensors[idx] = sensor
+                    set_sensor_locked(idx, sensor)
                 break
             except Exception as e:
                 # Exponential backoff
@@ -390,7 +668,7 @@ def check_sensor_status():
     
     with sensor_lock:
         for idx in range(8):
-            channel = idx // 2
+            channel = _SENSOR_CHANNEL[idx]
             sensor = sensors[idx]
             if sensor is not None:
                 try:
@@ -405,10 +683,10 @@ def check_sensor_status():
                         status_list.append(f"Sensor {idx} ({SENSOR_NAMES[idx]}): Connected, Calibration: {cal}")
                     except Exception as e:
                         status_list.append(f"Sensor {idx} ({SENSOR_NAMES[idx]}): Error checking status - {e}")
-                        sensors[idx] = None  # Mark as disconnected
+                        set_sensor_locked(idx, None)  # Mark as disconnected
                 except Exception as e:
                     status_list.append(f"Sensor {idx} ({SENSOR_NAMES[idx]}): Error - {e}")
-                    sensors[idx] = None  # Mark as disconnected
+                    set_sensor_locked(idx, None)  # Mark as disconnected
             else:
                 status_list.append(f"Sensor {idx} ({SENSOR_NAMES[idx]}): Not Initialized")
     
@@ -416,7 +694,8 @@ def check_sensor_status():
 
 def emergency_i2c_recovery():
     """More aggressive I2C bus recovery when all sensors fail"""
-    global i2c
+    global i2c, mux_channel
+    mux_channel = -1
     try:
         # Less verbose logging during recovery
         log("Emergency I2C recovery initiated", LOG_WARNING)
@@ -444,7 +723,7 @@ def emergency_i2c_recovery():
         time.sleep_ms(5)
         
         # Now reinitialize the I2C bus with higher frequency for better performance
-        i2c = machine.I2C(1, sda=machine.Pin(cfg.SDA_PIN), scl=machine.Pin(cfg.SCL_PIN), freq=400000)
+        i2c = create_i2c()
         time.sleep_ms(200)  # Reduced wait time but still sufficient
         
         # Check if multiplexer is visible
@@ -463,11 +742,12 @@ def emergency_i2c_recovery():
 
 def reset_multiplexer():
     """Reset the I2C multiplexer by power cycling it if possible or sending reset sequence"""
-    global i2c
+    global i2c, mux_channel
+    mux_channel = -1
     log("Attempting to reset the I2C multiplexer...", LOG_DEBUG)
     try:
         # Try to reset all channels by writing 0
-        i2c.writeto(cfg.MUX_ADDR, bytes([0]))
+        i2c.writeto(cfg.MUX_ADDR, _MUX_DISABLE)
         time.sleep_ms(50)  # Reduced from 100ms
         
         # Then try to read from the device to confirm it's working
@@ -480,7 +760,7 @@ def reset_multiplexer():
             
         # If that doesn't work, attempt to restart the I2C bus
         log("Attempting to restart I2C bus...", LOG_WARNING)
-        i2c = machine.I2C(1, sda=machine.Pin(cfg.SDA_PIN), scl=machine.Pin(cfg.SCL_PIN), freq=400000)
+        i2c = create_i2c()
         time.sleep_ms(100)  # Reduced from 200ms
         return True
     except Exception as e:
@@ -490,16 +770,20 @@ def reset_multiplexer():
 def sensor_reading_thread():
     """
     Continuously read quaternion data from all sensors and send as a binary UDP packet.
-    The packet contains 32 floats (8 sensors x 4 floats per sensor).
+    Each packet is a little-endian '<HH' header (uint16 sequence number, uint16
+    payload length) followed by 32 int16 values (8 sensors x w, x, y, z) in the
+    BNO055's raw units of 1/16384.
     Also periodically checks sensor status for disconnections.
     """
-    global reading_enabled, emergency_stop, sensors, sensor_data_buffer
+    global reading_enabled, emergency_stop, sensors
     
     udp_sock = None
+    frame_timer = None
     
     # Set up periodic sensor checking (every ~5 seconds)
     last_check_time = time.ticks_ms()
     check_interval = 5000  # ms
+    check_idx = 0  # Round-robin index of the next sensor to check
     
     # Packet stats
     packet_count = 0
@@ -507,14 +791,42 @@ def sensor_reading_thread():
     stats_interval = 10000  # 10 seconds
     
     try:
-        # Create UDP socket with explicit timeout to avoid blocking
+        # Connect the UDP socket once so lwIP caches the destination, then make it
+        # non-blocking so a full TX queue drops a frame instead of stalling the loop
         udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        udp_sock.settimeout(0.1)  # 100ms timeout to prevent blocking
-        dest = (cfg.RECEIVER_IP, cfg.UDP_PORT)
+        udp_sock.connect((cfg.RECEIVER_IP, cfg.UDP_PORT))
+        # Reserve send buffer space for a few packets up front where supported
+        try:
+            udp_sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, len(_PKT) * 8)
+        except Exception:
+            pass
+        udp_sock.setblocking(False)
         
         # Add a sequence number to detect packet loss
         seq_num = 0
         
+        # Frame pacing against a fixed deadline so slow frames don't accumulate drift
+        period_ms = 1000 // cfg.SAMPLE_RATE_HZ
+        next_deadline = time.ticks_ms()
+        
+        # Prefer a hardware timer: its callback releases frame_tick every period and
+        # the loop blocks on it, so frame starts don't depend on sleep granularity
+        frame_tick = None
+        if cfg.FRAME_TIMER_ID is not None:
+            try:
+                frame_tick = _thread.allocate_lock()
+                frame_tick.acquire()
+                
+                def release_frame_tick(timer):
+                    if frame_tick.locked():
+                        frame_tick.release()
+                
+                frame_timer = machine.Timer(cfg.FRAME_TIMER_ID)
+                frame_timer.init(period=period_ms, mode=machine.Timer.PERIODIC, callback=release_frame_tick)
+            except Exception as e:
+                log(f"Frame timer unavailable, pacing with sleep: {e}", LOG_WARNING)
+                frame_tick = None
+        
         log("Starting sensor data streaming")
         
         with reading_lock:
@@ -529,11 +841,11 @@ def sensor_reading_thread():
                 log("Emergency stop detected, ending sensor thread", LOG_WARNING)
                 break
                 
-            # Check if reading is still enabled
-            with reading_lock:
-                if not reading_enabled:
-                    log("Reading disabled, ending sensor thread", LOG_INFO)
-                    break
+            # Check if reading is still enabled (a plain read; reading_lock only
+            # guards the start/stop read-modify-write in the command handlers)
+            if not reading_enabled:
+                log("Reading disabled, ending sensor thread", LOG_INFO)
+                break
             
             # Increment sequence number (wrap around at 65535)
             seq_num = (seq_num + 1) % 65536
@@ -545,104 +857,105 @@ def sensor_reading_thread():
                 last_check_time = current_time
                 
                 # Only check one sensor per cycle to reduce overhead
-                sensor_to_check = (int(current_time) % 8)
+                sensor_to_check = check_idx
+                check_idx = (check_idx + 1) & 7
                 
                 with sensor_lock:
                     if sensors[sensor_to_check] is not None:
-                        channel = sensor_to_check // 2
+                        channel = _SENSOR_CHANNEL[sensor_to_check]
                         select_sensor(channel)
                         try:
                             # Use cal_status() to check sensor connection
-                            sensor_cal = sensors[sensor_to_check].cal_status()
+                            sensors[sensor_to_check].cal_status()
                             # Sensor is still connected if we get here
                             
-                            # Save calibration data periodically if reasonably calibrated
-                            if sensor_cal > 50:
+                            # Save calibration data periodically if the driver supports it
+                            if CAN_SAVE_CALIBRATION:
                                 save_calibration(sensors[sensor_to_check], sensor_to_check)
                                 
                         except Exception as e:
                             log(f"WARNING: Sensor {sensor_to_check} ({SENSOR_NAMES[sensor_to_check]}) appears to be disconnected: {e}", LOG_WARNING)
-                            sensors[sensor_to_check] = None
+                            set_sensor_locked(sensor_to_check, None)
             
             # Log stats periodically
             if time.ticks_diff(current_time, last_stats_time) >= stats_interval:
                 elapsed_sec = time.ticks_diff(current_time, last_stats_time) / 1000
                 rate = packet_count / elapsed_sec if elapsed_sec > 0 else 0
-                log(f"Streaming stats: {rate:.1f} packets/sec", LOG_DEBUG)
+                log_if(LOG_DEBUG, "Streaming stats: {:.1f} packets/sec", rate)
                 last_stats_time = current_time
                 packet_count = 0
-                
-                # Run GC during stats to avoid impacting streaming too much
-                gc.collect()
             
-            # Read data from sensors more efficiently
+            # Read data from sensors more efficiently. Both sensors of a pair share
+            # a multiplexer channel, so select each channel once and read both.
+            # The sensor slots are copied into the preallocated _SNAP under
+            # sensor_lock, and the reads work from that copy; sensors that fail
+            # are collected in a bitmask and cleared under the lock once per
+            # frame, so other threads never wait on the I2C reads.
             with sensor_lock:
-                for idx in range(8):
-                    channel = idx // 2
-                    select_sensor(channel)
-                    sensor = sensors[idx]
-                    if sensor is not None:
-                        try:
-                            quat = sensor.quaternion()
-                            if len(quat) == 4:
-                                # Faster assignment without extending lists
-                                data_idx = idx * 4
-                                sensor_data_buffer[data_idx] = quat[0]
-                                sensor_data_buffer[data_idx+1] = quat[1]
-                                sensor_data_buffer[data_idx+2] = quat[2]
-                                sensor_data_buffer[data_idx+3] = quat[3]
-                            else:
-                                # Invalid quaternion - use zeros
-                                data_idx = idx * 4
-                                sensor_data_buffer[data_idx] = 0.0
-                                sensor_data_buffer[data_idx+1] = 0.0
-                                sensor_data_buffer[data_idx+2] = 0.0
-                                sensor_data_buffer[data_idx+3] = 0.0
-                        except Exception as e:
-                            # Error reading - use zeros and mark sensor as disconnected
-                            data_idx = idx * 4
-                            sensor_data_buffer[data_idx] = 0.0
-                            sensor_data_buffer[data_idx+1] = 0.0
-                            sensor_data_buffer[data_idx+2] = 0.0
-                            sensor_data_buffer[data_idx+3] = 0.0
-                            sensors[idx] = None
-                    else:
-                        # Sensor not available - use zeros
-                        data_idx = idx * 4
-                        sensor_data_buffer[data_idx] = 0.0
-                        sensor_data_buffer[data_idx+1] = 0.0
-                        sensor_data_buffer[data_idx+2] = 0.0
-                        sensor_data_buffer[data_idx+3] = 0.0
+                _SNAP[:] = sensors
+            failed = read_quats(i2c, select_sensor, _SNAP, _SENSOR_ADDR, _PKT_QUAT)
+            
+            if failed:
+                with sensor_lock:
+                    for idx in range(8):
+                        # Skip slots replaced by a reinitialization in the meantime
+                        if failed & (1 << idx) and sensors[idx] is _SNAP[idx]:
+                            set_sensor_locked(idx, None)
             
             try:
-                # For improved readability, create a human-readable JSON-like format
-                # Include sequence number and formatted sensor data
-                readable_data = "SEQ:{},".format(seq_num)
-                
-                # Add each sensor's quaternion data with labels
-                for i in range(8):
-                    base_idx = i * 4
-                    readable_data += "S{}:[{:.4f},{:.4f},{:.4f},{:.4f}],".format(
-                        i,
-                        sensor_data_buffer[base_idx],
-                        sensor_data_buffer[base_idx+1],
-                        sensor_data_buffer[base_idx+2], 
-                        sensor_data_buffer[base_idx+3]
-                    )
-                
-                # Remove the trailing comma and convert to bytes
-                readable_data = readable_data[:-1].encode()
-                
-                # Send the readable data format
-                udp_sock.sendto(readable_data, dest)
+                if cfg.DEBUG_TEXT_PACKET:
+                    # Human-readable format, for diagnostics only
+                    readable_data = "SEQ:{},".format(seq_num)
+                    raw = struct.unpack_from('<32h', _PKT, _PKT_HEADER_SIZE)
+                    
+                    # Add each sensor's quaternion data with labels
+                    for i in range(8):
+                        base_idx = i * 4
+                        readable_data += "S{}:[{:.4f},{:.4f},{:.4f},{:.4f}],".format(
+                            i,
+                            raw[base_idx] * _QUAT_SCALE,
+                            raw[base_idx+1] * _QUAT_SCALE,
+                            raw[base_idx+2] * _QUAT_SCALE, 
+                            raw[base_idx+3] * _QUAT_SCALE
+                        )
+                    
+                    # Remove the trailing comma and convert to bytes
+                    udp_sock.send(readable_data[:-1].encode())
+                else:
+                    # Quaternions are already in place; store the little-endian
+                    # sequence number directly instead of parsing a struct format
+                    _PKT[0] = seq_num & 0xFF
+                    _PKT[1] = seq_num >> 8
+                    udp_sock.send(_PKT)
+            except OSError as e:
+                # No free TX buffers right now - drop this frame silently
+                if e.args[0] not in (errno.EAGAIN, errno.ENOMEM):
+                    log("Error sending UDP packet: {}".format(e), LOG_WARNING)
             except Exception as e:
                 log("Error sending UDP packet: {}".format(e), LOG_WARNING)
             
-            time.sleep_ms(15)
+            if frame_tick is not None:
+                # A tick that fired while this frame ran is already pending, so a
+                # late frame starts the next one at once without queueing more
+                frame_tick.acquire()
+                continue
+            
+            next_deadline = time.ticks_add(next_deadline, period_ms)
+            delay = time.ticks_diff(next_deadline, time.ticks_ms())
+            if delay > 0:
+                time.sleep_ms(delay)
+            else:
+                # Running behind - restart the schedule instead of bursting to catch up
+                next_deadline = time.ticks_ms()
             
     except Exception as e:
         log(f"Sensor reading thread error: {e}", LOG_ERROR)
     finally:
+        if frame_timer:
+            try:
+                frame_timer.deinit()
+            except Exception:
+                pass
         if udp_sock:
             try:
                 udp_sock.close()
@@ -652,20 +965,30 @@ def sensor_reading_thread():
             reading_enabled = False
         log("Sensor reading thread stopped.")
 
+# Jump table offsets of the commands accepted while streaming (X, Q, P)
+_STREAMING_OPS = (ord('X') - 0x41, ord('Q') - 0x41, ord('P') - 0x41)
+
+# Command letter for each jump table slot, for log messages
+_COMMAND_NAMES = tuple(chr(0x41 + op) for op in range(26))
+
 def tcp_command_server_thread():
     """TCP server to handle commands from receiver"""
     global reading_enabled
     
-    command_handlers = {
-        'N': restart_node,
-        'C': check_sensor_command,
-        'I': reinitialize_sensors,
-        'S': start_streaming,
-        'X': stop_streaming,
-        'Q': emergency_stop_command,
-        'D': set_debug_mode,
-        'P': ping_command
-    }
+    # Jump table indexed by the command letter's offset from 'A'
+    command_handlers = [None] * 26
+    for code, handler in (
+        ('N', restart_node),
+        ('C', check_sensor_command),
+        ('I', reinitialize_sensors),
+        ('S', start_streaming),
+        ('X', stop_streaming),
+        ('Q', emergency_stop_command),
+        ('D', set_debug_mode),
+        ('P', ping_command)
+    ):
+        command_handlers[ord(code) - 0x41] = handler
+    command_handlers = tuple(command_handlers)
     
     while not check_emergency_stop():
         tcp_sock = None
@@ -713,7 +1036,7 @@ def tcp_command_server_thread():
         # Only restart if not in emergency stop
         if not check_emergency_stop():
             log("TCP server restarting in 5 seconds...", LOG_WARNING)
-            time.sleep_ms(5000)
+            sleep_feed(5000)
 
 def restart_node(params=None):
     """Restart node command handler"""
@@ -844,10 +1167,22 @@ def handle_command_client(client_sock, client_addr, command_handlers):
     global reading_enabled, emergency_stop, sensors
     
     try:
-        # Set a shorter timeout to allow more frequent checks for emergency stop
+        # The timeout only bounds a stalled send/recv; waiting for commands is
+        # done by poll() so emergency stop is noticed within 100 ms
         client_sock.settimeout(5.0)
+        # The connection is kept open between commands, so without this a reply
+        # can sit behind Nagle until the receiver ACKs the previous one
+        try:
+            client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except Exception:
+            # Not all MicroPython ports expose TCP_NODELAY
+            pass
+        poller = select.poll()
+        poller.register(client_sock, select.POLLIN)
         while not check_emergency_stop():
             try:
+                if not poller.poll(100):
+                    continue
                 data = client_sock.recv(1024)
                 if not data:
                     log(f"Command connection closed from {client_addr}")
@@ -856,14 +1191,30 @@ def handle_command_client(client_sock, client_addr, command_handlers):
                 # Feed watchdog on command receive
                 feed_watchdog()
                     
-                cmd_str = data.decode().strip()
-                
-                # Split into command and parameters
-                cmd_parts = cmd_str.split(':', 1)
-                cmd = cmd_parts[0].upper()
-                params = cmd_parts[1] if len(cmd_parts) > 1 else None
+                # Commands are a single letter, optionally followed by ":params".
+                # Dispatch on the first byte, case-folded by clearing the ASCII
+                # lowercase bit; handlers get params as bytes (int() parses them)
+                data = data.strip()
+                handler = None
+                params = None
+                op = -1
+                if len(data) == 1 or (len(data) > 1 and data[1] == 0x3A):
+                    op = (data[0] & 0xDF) - 0x41
+                    if 0 <= op < 26:
+                        handler = command_handlers[op]
+                    if len(data) > 2:
+                        params = data[2:]
+                if handler is not None:
+                    cmd = _COMMAND_NAMES[op]
+                else:
+                    # Unknown input may not be valid UTF-8; show raw bytes then
+                    cmd = data.partition(b':')[0]
+                    try:
+                        cmd = cmd.decode()
+                    except UnicodeError:
+                        cmd = repr(cmd)
                 
-                log(f"RECEIVED COMMAND: '{cmd}' from {client_addr}")
+                log_if(LOG_INFO, "RECEIVED COMMAND: '{}' from {}", cmd, client_addr)
                 
                 # Initialize response variable
                 response = "Unknown command"
@@ -871,18 +1222,16 @@ def handle_command_client(client_sock, client_addr, command_handlers):
                 should_restart = False
                 
                 # Check if streaming and handle accordingly
-                is_streaming = False
-                with reading_lock:
-                    is_streaming = reading_enabled
+                is_streaming = reading_enabled
                 
                 # If streaming, only accept X command or Q command
-                if is_streaming and cmd != "X" and cmd != "Q" and cmd != "P":
+                if is_streaming and op not in _STREAMING_OPS:
                     response = f"ERROR: Cannot execute '{cmd}' while streaming. Stop streaming first (X command)."
                     log(f"Rejecting command {cmd} due to active streaming", LOG_WARNING)
                     success = False
-                elif cmd in command_handlers:
+                elif handler is not None:
                     # Execute the appropriate command handler
-                    response, success, should_restart = command_handlers[cmd](params)
+                    response, success, should_restart = handler(params)
                 else:
                     response = f"Unknown command: {cmd}"
                     log(f"Received unknown command: {cmd}", LOG_WARNING)
@@ -891,26 +1240,22 @@ def handle_command_client(client_sock, client_addr, command_handlers):
                 # Send response for all commands
                 if not should_restart:  # Skip if we're about to restart
                     try:
-                        # Add status prefix to response for structured parsing
-                        status_prefix = "OK:" if success else "ERROR:"
-                        client_sock.send((status_prefix + response).encode())
+                        # Add status prefix to response for structured parsing; sent
+                        # as one write since the receiver reads the reply with one recv()
+                        client_sock.send((_OK_PREFIX if success else _ERR_PREFIX) + response.encode())
                     except Exception as e:
                         log(f"Error sending response: {e}", LOG_ERROR)
                 
                 # Handle restart if requested
                 if should_restart:
-                    client_sock.send("OK:Restarting node...".encode())
+                    client_sock.send(_RESTART_RESP)
                     log("Executing restart after command")
                     time.sleep_ms(500)  # Brief delay for response to be sent
                     machine.reset()
                     
             except OSError as e:
-                if "timed out" in str(e).lower():
-                    # Timeout is normal, continue silently
-                    continue
-                else:
-                    log(f"Error handling command: {e}", LOG_WARNING)
-                    break
+                log(f"Error handling command: {e}", LOG_WARNING)
+                break
     except Exception as e:
         log(f"Command client error: {e}", LOG_ERROR)
     finally:
@@ -919,64 +1264,31 @@ def handle_command_client(client_sock, client_addr, command_handlers):
         except Exception:
             pass
 
-def system_status_thread():
-    """
-    Periodically check and report system status
-    using a sleep-based approach for better reliability
-    """
-    start_time = time.ticks_ms()
+def report_status(start_time):
+    """Log a one-line summary of uptime, WiFi, sensors, streaming and memory"""
+    # Calculate uptime
+    uptime_ms = time.ticks_diff(time.ticks_ms(), start_time)
+    uptime_sec = uptime_ms // 1000
+    uptime_min = uptime_sec // 60
+    uptime_hr = uptime_min // 60
     
-    # FIX: Replace timer with sleep-based loop for better reliability
-    try:
-        while not check_emergency_stop():
-            try:
-                # Feed watchdog
-                feed_watchdog()
-                
-                # Calculate uptime
-                uptime_ms = time.ticks_diff(time.ticks_ms(), start_time)
-                uptime_sec = uptime_ms // 1000
-                uptime_min = uptime_sec // 60
-                uptime_hr = uptime_min // 60
-                
-                # Check WiFi status
-                sta = network.WLAN(network.STA_IF)
-                wifi_status = "Connected" if sta.isconnected() else "Disconnected"
-                
-                # Check sensor status
-                with sensor_lock:
-                    active_sensors = sum(1 for s in sensors if s is not None)
-                
-                # Check streaming status
-                with reading_lock:
-                    streaming_status = "Yes" if reading_enabled else "No"
-                    
-                # Check memory
-                free_mem = gc.mem_free()
-                
-                # Log the status
-                log(f"STATUS: Uptime: {int(uptime_hr)}h {int(uptime_min%60)}m {int(uptime_sec%60)}s | "
-                      f"WiFi: {wifi_status} | Active Sensors: {active_sensors}/8 | "
-                      f"Streaming: {streaming_status} | Free Mem: {free_mem}")
-                      
-                # Run garbage collection to prevent memory issues
-                gc.collect()
-                
-                # Sleep for 60 seconds (with small chunks to allow interrupt)
-                for _ in range(60):
-                    if check_emergency_stop():
-                        break
-                    time.sleep(1)
-                    feed_watchdog()
-                
-            except Exception as e:
-                log(f"Error in status thread: {e}", LOG_ERROR)
-                time.sleep(5)  # Short sleep on error before retry
-                
-    except KeyboardInterrupt:
-        log("Keyboard interrupt in status thread", LOG_WARNING)
-    except Exception as e:
-        log(f"Error in status thread: {e}", LOG_ERROR)
+    # Check WiFi status
+    sta = network.WLAN(network.STA_IF)
+    wifi_status = "Connected" if sta.isconnected() else "Disconnected"
+    
+    # Check sensor status
+    active_sensors = active_sensor_count
+    
+    # Check streaming status
+    streaming_status = "Yes" if reading_enabled else "No"
+        
+    # Check memory
+    free_mem = gc.mem_free()
+    
+    # Log the status
+    log_if(LOG_INFO, "STATUS: Uptime: {}h {}m {}s | WiFi: {} | Active Sensors: {}/8 | "
+           "Streaming: {} | Free Mem: {}", uptime_hr, uptime_min % 60, uptime_sec % 60,
+           wifi_status, active_sensors, streaming_status, free_mem)
 
 def cleanup_resources():
     """Stop all threads and clean up resources"""
@@ -991,6 +1303,7 @@ def cleanup_resources():
     with tcp_lock:
         global receiver_tcp
         if receiver_tcp:
+            _flush_logs_locked()
             try:
                 receiver_tcp.close()
             except Exception:
@@ -1118,18 +1431,25 @@ def main():
                 # Start the TCP command server in a separate thread
                 _thread.start_new_thread(tcp_command_server_thread, ())
                 
-                # Start the status reporting thread
-                _thread.start_new_thread(system_status_thread, ())
-                
                 log("Node is running. Awaiting commands...")
                 log("Send 'Q' command for emergency stop")
                 log("Press Ctrl+C to enter REPL mode")
                 
-                # Main thread's health monitoring loop
+                # Main thread's health monitoring loop, which also reports status
+                # once a minute instead of running a separate status thread
+                start_time = time.ticks_ms()
+                next_status = start_time
                 while not check_emergency_stop():
                     # Feed watchdog
                     feed_watchdog()
                     
+                    if time.ticks_diff(time.ticks_ms(), next_status) >= 0:
+                        try:
+                            report_status(start_time)
+                        except Exception as e:
+                            log(f"Error reporting status: {e}", LOG_ERROR)
+                        next_status = time.ticks_add(time.ticks_ms(), 60000)
+                    
                     # Check WiFi connection with improved recovery
                     sta = network.WLAN(network.STA_IF)
                     if not sta.isconnected():
@@ -1167,10 +1487,6 @@ def main():
                             time.sleep_ms(1000)
                             machine.reset()
                         
-                    # Run garbage collection occasionally
-                    if time.ticks_ms() % 60000 < 1000:  # roughly once per minute
-                        gc.collect()
-                        
                     time.sleep_ms(1000)  # Check health every second
                     
             except KeyboardInterrupt:
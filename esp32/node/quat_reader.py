@@ -0,0 +1,33 @@
+# quat_reader.py Native-compiled quaternion read loop for the sensor node.
+# Kept in its own module so that main.py can fall back to its pure-Python
+# _read_quats on firmware built without the native code emitter; keep the two
+# in step.
+
+import micropython
+from bno055 import QUAT_DATA
+
+
+@micropython.native
+def read_quats(i2c, select, snap, addrs, slots):
+    """Read all 8 sensors' raw quaternions into slots; returns a bitmask of failed sensors"""
+    failed = 0
+    for channel in range(4):
+        # Only switch the multiplexer for channels with a live sensor
+        if snap[channel * 2] is not None or snap[channel * 2 + 1] is not None:
+            select(channel)
+        for sub in range(2):
+            idx = channel * 2 + sub
+            slot = slots[idx]
+            if snap[idx] is not None:
+                try:
+                    # One burst read of the quaternion registers straight into
+                    # the packet, bypassing the driver's tuple building
+                    i2c.readfrom_mem_into(addrs[idx], QUAT_DATA, slot)
+                    continue
+                except Exception:
+                    failed |= 1 << idx
+            
+            # Sensor not available or read failed - use zeros
+            for k in range(8):
+                slot[k] = 0
+    return failed
@@ -7,4 +7,17 @@ NODE_IP = "192.168.4.2"
 
 # Ports
 TCP_PORT = 5006
-UDP_PORT = 5005
\ No newline at end of file
+UDP_PORT = 5005
+
+# Socket buffers (bytes), halved until the network stack accepts them.
+# lwIP also caps a UDP socket at a fixed number of queued datagrams, and
+# the ESP32 heap could not back a much larger receive buffer anyway.
+UDP_RCVBUF = 65535
+TCP_SNDBUF = 16384
+
+# Performance
+CPU_FREQ = 240000000
+UDP_THREAD_STACK = 8192  # bytes, None keeps the firmware default
+
+# Hardware timer that wakes the status report (None = poll with sleep_ms)
+STATUS_TIMER_ID = 0
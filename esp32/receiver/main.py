@@ -6,20 +6,47 @@ import time
 import _thread
 import struct
 import gc
+import micropython
+from micropython import const
 import config_receiver as cfg
 import machine
 
 # Constants for better readability
-HEARTBEAT_TIMEOUT = 60  # seconds
-CMD_RESTART_NODE = 'N'
-CMD_RESTART_RECEIVER = 'R'
-CMD_START_STREAMING = 'S'
-CMD_STOP_STREAMING = 'X'
-CMD_CHECK_SENSORS = 'C'
-CMD_REINIT_SENSORS = 'I'
-CMD_QUIT = 'Q'
-CMD_DEBUG = 'D'
-CMD_PING = 'P'
+HEARTBEAT_TIMEOUT = const(60)  # seconds
+CMD_RESTART_NODE = b'N'
+CMD_RESTART_RECEIVER = b'R'
+CMD_START_STREAMING = b'S'
+CMD_STOP_STREAMING = b'X'
+CMD_CHECK_SENSORS = b'C'
+CMD_REINIT_SENSORS = b'I'
+CMD_QUIT = b'Q'
+CMD_DEBUG = b'D'
+CMD_PING = b'P'
+
+# Binary sensor packet from the node: little-endian header (uint16 sequence,
+# uint16 payload length) followed by the payload, forwarded to the computer as-is
+DATA_HEADER_FORMAT = '<HH'
+DATA_HEADER_SIZE = const(4)
+DATA_PREFIX = b"DATA:"
+
+# Binary heartbeat from the node: b"H" then uint8 active sensors, uint8 total
+# sensors, uint16 free memory in KB and a reserved byte
+HEARTBEAT_FORMAT = '<BBHB'
+HEARTBEAT_SIZE = const(6)
+
+# First byte of each message type on the node's TCP connection; const() folds
+# them into the bytecode of the dispatcher
+_MSG_HEARTBEAT = const(0x48)  # 'H'
+_MSG_LOG = const(0x4C)  # 'L', "LOG:..."
+_MSG_NODE_CONNECTED = const(0x4E)  # 'N'
+_NODE_RESPONSE_PREFIX = b"LOG:[NODE] Command response: "
+
+# USB CDC writers, resolved once instead of on every log line and packet
+_STDOUT_TEXT_WRITE = sys.stdout.write
+_STDOUT_TEXT_FLUSH = getattr(sys.stdout, "flush", None) or (lambda: None)
+_STDOUT_BUFFER = getattr(sys.stdout, "buffer", sys.stdout)
+_STDOUT_WRITE = _STDOUT_BUFFER.write
+_STDOUT_FLUSH = getattr(_STDOUT_BUFFER, "flush", None) or (lambda: None)
 
 # Global emergency stop flag for consistent thread termination
 emergency_stop = False
@@ -32,22 +59,70 @@ try:
 except Exception as e:
     print(f"Warning: Could not initialize watchdog: {e}")
 
+# Run at full clock so the UDP forwarding thread keeps up with the node
+try:
+    machine.freq(cfg.CPU_FREQ)
+except Exception as e:
+    print(f"Warning: Could not set CPU frequency: {e}")
+
+def reset_gc_threshold():
+    """Collect now and let the heap trigger the next collection by allocation volume"""
+    gc.collect()
+    try:
+        gc.threshold(gc.mem_free() // 4 + gc.mem_alloc())
+    except Exception as e:
+        print(f"Warning: Could not set GC threshold: {e}")
+
+# Collection is driven by allocation volume instead of being forced from the
+# status and streaming paths
+reset_gc_threshold()
+
+def start_thread_with_stack(func, args, stack_size):
+    """Start a thread with its own stack size, restoring the default afterwards"""
+    previous = None
+    if stack_size:
+        try:
+            previous = _thread.stack_size(stack_size)
+        except (AttributeError, ValueError) as e:
+            print(f"Warning: Could not set thread stack size: {e}")
+    try:
+        _thread.start_new_thread(func, args)
+    finally:
+        if previous is not None:
+            _thread.stack_size(previous)
+
+# Error text that means a non-blocking socket simply had nothing ready
+_EAGAIN_TOKENS = ("eagain", "would block", "nonblocking")
+
+def is_would_block(e):
+    """True if the exception is a non-blocking socket's 'no data yet' error"""
+    s = str(e).lower()
+    return any(t in s for t in _EAGAIN_TOKENS)
+
 # Log levels for better filtering
-LOG_DEBUG = 0
-LOG_INFO = 1
-LOG_WARNING = 2
-LOG_ERROR = 3
+LOG_DEBUG = const(0)
+LOG_INFO = const(1)
+LOG_WARNING = const(2)
+LOG_ERROR = const(3)
+
+_LOG_LEVEL_NAMES = ("DEBUG", "INFO", "WARNING", "ERROR")
+_LOG_LEVEL_PREFIXES = ("[DEBUG] ", "", "[WARNING] ", "[ERROR] ")
+
+# Periodic status line, filled in by system_status_thread
+_STATUS_FMT = ("STATUS: Uptime: %dh %dm %ds | WiFi AP: %s | Node: %s | "
+               "UDP: %s | Last HB: %s | Free Mem: %d")
+_BANNER_EXIT = ("\n\n\n============================================\n"
+                "KEYBOARD INTERRUPT DETECTED - FORCING EXIT\n"
+                "============================================")
 
-# Current log level with thread-safe access
+# Current log level; writers hold log_level_lock
 current_log_level = LOG_INFO
-log_level_lock = _thread.allocate_lock()  # Lock for thread safety
+log_level_lock = _thread.allocate_lock()
 
 def check_emergency_stop():
     """Check if emergency stop is activated"""
-    global emergency_stop
-    
-    with emergency_lock:
-        return emergency_stop
+    # A single global read is atomic; emergency_lock only guards writers
+    return emergency_stop
 
 def set_emergency_stop():
     """Set emergency stop flag"""
@@ -66,47 +141,60 @@ def feed_watchdog():
         except Exception:
             pass
 
+# Last formatted log timestamp and the second it was built for
+_ts_cache_sec = -1
+_ts_cache_str = ""
+
+# Log lines are flushed at most this often; flush_log() pushes out the rest
+LOG_FLUSH_INTERVAL_MS = const(20)
+_last_log_flush = 0
+
 # Logger with log levels
-def log(message, level=LOG_INFO, source="RECEIVER"):
+def log(message, level=LOG_INFO, source="RECEIVER", args=None):
     """
     Send logs to controller with improved formatting and filtering
     Args:
-        message: The message to log
+        message: The message to log, or a %-format string when args is given
         level: Log level (LOG_DEBUG, LOG_INFO, LOG_WARNING, LOG_ERROR)
         source: Source of the log message
+        args: Format arguments, applied only if the message is not filtered out
     """
-    global current_log_level
-    
-    # Skip messages below current log level with thread safety
-    with log_level_lock:
-        if level < current_log_level:
-            return
+    # Skip messages below current log level; reading the int is atomic, so
+    # log_level_lock is only taken by the code that changes it
+    if level < current_log_level:
+        return
     
-    # Get log level prefix
-    level_prefix = ""
-    if level == LOG_DEBUG:
-        level_prefix = "[DEBUG] "
-    elif level == LOG_WARNING:
-        level_prefix = "[WARNING] "
-    elif level == LOG_ERROR:
-        level_prefix = "[ERROR] "
+    if args is not None:
+        message = message % args
     
+    # The timestamp only changes once a second, so reuse the last one built
+    global _ts_cache_sec, _ts_cache_str
     try:
-        t = time.localtime()
-        timestamp = "[{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}] ".format(t[0], t[1], t[2], t[3], t[4], t[5])
+        sec = time.time()
+        if sec != _ts_cache_sec:
+            t = time.localtime(sec)
+            _ts_cache_str = "[{:04d}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}] ".format(t[0], t[1], t[2], t[3], t[4], t[5])
+            _ts_cache_sec = sec
+        timestamp = _ts_cache_str
     except Exception:
         timestamp = ""
         
-    formatted = "[" + source + "] " + timestamp + level_prefix + message
-    
-    # Then send to the computer with the LOG: prefix
+    # Send to the computer with the LOG: prefix, built in one concatenation
     try:
-        sys.stdout.write("LOG:" + formatted + "\n")
-        if hasattr(sys.stdout, "flush"):
-            sys.stdout.flush()
+        _STDOUT_TEXT_WRITE("LOG:[" + source + "] " + timestamp +
+                           _LOG_LEVEL_PREFIXES[level] + message + "\n")
+        now = time.ticks_ms()
+        if time.ticks_diff(now, _last_log_flush) >= LOG_FLUSH_INTERVAL_MS:
+            flush_log(now)
     except Exception as e:
         print(f"Error sending log to controller: {e}")
 
+def flush_log(now=None):
+    """Flush log lines still held back by log()"""
+    global _last_log_flush
+    _STDOUT_TEXT_FLUSH()
+    _last_log_flush = time.ticks_ms() if now is None else now
+
 def validate_config():
     """Validate that configuration values are reasonable"""
     if not cfg.SSID or len(cfg.SSID) > 32:
@@ -178,6 +266,24 @@ class NetworkManager:
         
         return False
 
+    def set_socket_buffer(self, sock, option, size):
+        """Set a socket buffer size, halving it down to 8 KB until accepted"""
+        opt = getattr(socket, option, None)
+        if opt is None:
+            # Not all MicroPython implementations support this option
+            return 0
+        while size >= 8192:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, opt, size)
+                # Logged at INFO so the size a given firmware accepted shows up
+                # in the host log when diagnosing packet loss
+                log("%s set to %d bytes", args=(option, size))
+                return size
+            except OSError:
+                size = (size + 1) // 2
+        log(f"{option} not accepted, using default", LOG_WARNING)
+        return 0
+
     def create_tcp_socket(self):
         """Create TCP socket"""
         try:
@@ -193,6 +299,8 @@ class NetworkManager:
             self.tcp_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.tcp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             
+            self.set_socket_buffer(self.tcp_socket, "SO_SNDBUF", cfg.TCP_SNDBUF)
+            
             # Set additional socket options if available
             try:
                 # Keep-alive can help detect stale connections
@@ -226,12 +334,8 @@ class NetworkManager:
             self.udp_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
             self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             
-            # Set larger receive buffer if supported
-            try:
-                self.udp_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8192)
-            except Exception:
-                # Not all MicroPython implementations support this option
-                pass
+            # Large receive buffer so GC pauses don't drop datagrams
+            self.set_socket_buffer(self.udp_socket, "SO_RCVBUF", cfg.UDP_RCVBUF)
                 
             self.udp_socket.bind((cfg.AP_IP, cfg.UDP_PORT))
             self.udp_socket.setblocking(False)
@@ -277,15 +381,33 @@ class TCPServer:
     """
     def __init__(self, tcp_socket):
         self.tcp_socket = tcp_socket
+        # node_conn is only written by the client handler thread (and cleared by
+        # stop()); attribute assignment is atomic, so readers need no lock and
+        # must simply tolerate seeing None
         self.node_conn = None
         self.running = True
         self._last_heartbeat = 0
-        # Thread-safe lock for node_conn and heartbeat access
-        self.conn_lock = _thread.allocate_lock()
+        # Thread-safe lock for heartbeat access
         self.heartbeat_lock = _thread.allocate_lock()
         
-        # Pre-allocate receive buffer
-        self.recv_buffer = bytearray(4096)
+        # Command connection to the node, kept open between commands
+        self._cmd_sock = None
+        
+        # Accepted connections are handed to one long-lived worker thread
+        # (client_worker) instead of a new thread per connection. _client_ready
+        # is held while the worker has nothing to do.
+        self._pending = None
+        self._signalled = False
+        self._handoff_lock = _thread.allocate_lock()
+        self._client_ready = _thread.allocate_lock()
+        self._client_ready.acquire()
+        
+        # Node messages keyed by their first byte; anything else is a command response
+        self._dispatch = {
+            _MSG_HEARTBEAT: self._on_heartbeat,
+            _MSG_LOG: self._on_log,
+            _MSG_NODE_CONNECTED: self._on_node_connected
+        }
         
     @property
     def last_heartbeat(self):
@@ -299,18 +421,21 @@ class TCPServer:
         
     def run(self):
         """Main accept loop that handles incoming connections with watchdog feeding"""
+        # Local aliases keep global and attribute lookups out of the loop
+        feed = feed_watchdog
+        accept = self.tcp_socket.accept
+        hand_over = self._hand_over
         while self.running and not check_emergency_stop():
             try:
                 # Feed watchdog in accept loop
-                feed_watchdog()
+                feed()
                 
-                # Accept with timeout to allow for interruption
-                self.tcp_socket.settimeout(3.0)
-                client_sock, client_addr = self.tcp_socket.accept()
+                # Accept times out (set once in create_tcp_socket) to allow for interruption
+                client_sock, client_addr = accept()
                 log(f"TCP connection established from {client_addr}")
                 
-                # Handle the client in a new thread to avoid blocking new connections
-                _thread.start_new_thread(self.handle_client, (client_sock, client_addr))
+                # The client worker picks it up; accepting never blocks on a client
+                hand_over((client_sock, client_addr))
                 
             except OSError as e:
                 error_str = str(e).lower()
@@ -333,114 +458,194 @@ class TCPServer:
         # Set running flag to false to stop accept loop
         self.running = False
         
-        # Close node connection if it exists
-        with self.conn_lock:
-            if self.node_conn is not None:
-                try:
-                    self.node_conn.close()
-                except Exception as e:
-                    log(f"Error closing node connection: {e}", LOG_DEBUG)
-                self.node_conn = None
+        # Drop the node connection; handle_client sees running is False and
+        # closes the socket itself in its finally block
+        self.node_conn = None
+        self._close_command_socket()
+        
+        # Wake the client worker so it can exit
+        self._hand_over(None)
         
         # Close TCP socket if it exists
-        if hasattr(self, 'tcp_socket') and self.tcp_socket is not None:
+        if self.tcp_socket is not None:
             try:
                 self.tcp_socket.close()
             except Exception as e:
-                log(f"Error closing TCP socket: {e}", LOG_DEBUG)
+                log("Error closing TCP socket: %s", LOG_DEBUG, args=(e,))
             self.tcp_socket = None
         
         log("TCP server stopped")
 
+    def _hand_over(self, client):
+        """Pass an accepted (socket, address) pair, or None, to the client worker"""
+        with self._handoff_lock:
+            previous = self._pending
+            self._pending = client
+            signalled = self._signalled
+            self._signalled = True
+        if previous is not None:
+            # Superseded before the worker got to it
+            try:
+                previous[0].close()
+            except Exception:
+                pass
+        if not signalled:
+            self._client_ready.release()
+
+    def client_worker(self):
+        """Serve accepted node connections one at a time on a single thread"""
+        while True:
+            self._client_ready.acquire()
+            with self._handoff_lock:
+                client = self._pending
+                self._pending = None
+                self._signalled = False
+            if not self.running:
+                if client is not None:
+                    try:
+                        client[0].close()
+                    except Exception:
+                        pass
+                break
+            if client is not None:
+                self.handle_client(client[0], client[1])
+
+    def _consume(self, data):
+        """
+        Dispatch every complete message in data; returns the bytes used.
+        Heartbeats are a fixed 6 bytes and everything else ends with a newline,
+        so a message split across recv() calls waits for the rest.
+        """
+        dispatch = self._dispatch
+        on_response = self._on_response
+        pos = 0
+        n = len(data)
+        while pos < n:
+            first = data[pos]
+            if first == _MSG_HEARTBEAT:
+                end = pos + HEARTBEAT_SIZE
+                if end > n:
+                    break
+            else:
+                nl = data.find(b"\n", pos)
+                if nl == -1:
+                    if first in dispatch:
+                        break
+                    # Unframed response; take the rest as before
+                    end = n
+                else:
+                    end = nl + 1
+                    # Consecutive LOG: lines go to the computer in one write
+                    while first == _MSG_LOG and end < n and data[end] == _MSG_LOG:
+                        nl = data.find(b"\n", end)
+                        if nl == -1:
+                            break
+                        end = nl + 1
+            # Dispatch on the first byte of the message
+            dispatch.get(first, on_response)(data if pos == 0 and end == n else data[pos:end])
+            pos = end
+        return pos
+
+    def _on_heartbeat(self, data):
+        """b"H" + uint8 active sensors, uint8 total, uint16 free memory in KB, reserved byte"""
+        self.last_heartbeat = time.ticks_ms()
+        if current_log_level <= LOG_DEBUG and len(data) >= HEARTBEAT_SIZE:
+            active, total, mem_kb, _ = struct.unpack_from(HEARTBEAT_FORMAT, data, 1)
+            log("Node heartbeat - Sensors: %d/%d, Mem: %dKB", LOG_DEBUG, args=(active, total, mem_kb))
+
+    def _on_log(self, data):
+        """LOG: lines from the node, forwarded to the computer unchanged"""
+        _STDOUT_WRITE(data)
+        if data[-1] != 0x0A:
+            _STDOUT_WRITE(b"\n")
+        _STDOUT_FLUSH()
+
+    def _on_node_connected(self, data):
+        """NODE_CONNECTED[:<protocol version>]"""
+        log("Node connected and ready")
+        sep = data.find(b":")
+        if sep != -1:
+            log(f"Node protocol version: {data[sep + 1:].decode().strip()}")
+
+    def _on_response(self, data):
+        """Any other message from the node, forwarded to the computer as a command response"""
+        log("Response from node: %d bytes", LOG_DEBUG, args=(len(data),))
+        # Forwarded as bytes behind a fixed prefix, without decoding or formatting
+        _STDOUT_WRITE(_NODE_RESPONSE_PREFIX)
+        _STDOUT_WRITE(data)
+        if data[-1] != 0x0A:
+            _STDOUT_WRITE(b"\n")
+        _STDOUT_FLUSH()
+
     def handle_client(self, client_sock, addr):
         """Handle client connection with improved timeout handling and error recovery"""
-        with self.conn_lock:
-            # Close existing connection if any
-            if self.node_conn is not None:
-                try:
-                    self.node_conn.close()
-                except Exception as e:
-                    log(f"Error closing previous node connection: {e}", LOG_DEBUG)
-                self.node_conn = None
-            self.node_conn = client_sock
+        # Take over as the node connection, then close any existing one
+        previous = self.node_conn
+        self.node_conn = client_sock
+        if previous is not None:
+            try:
+                previous.close()
+            except Exception as e:
+                log("Error closing previous node connection: %s", LOG_DEBUG, args=(e,))
             
+        poller = None
         try:
-            # Use non-blocking with select instead of settimeout which isn't available
+            # Use non-blocking with a poller instead of settimeout which isn't available.
+            # The socket is registered once rather than on every select() call.
             client_sock.setblocking(False)
-            last_activity = time.ticks_ms()
+            poller = select.poll()
+            poller.register(client_sock, select.POLLIN)
+            
+            # Local aliases keep global and attribute lookups out of the loop
+            ticks_ms = time.ticks_ms
+            ticks_diff = time.ticks_diff
+            feed = feed_watchdog
+            poll = poller.poll
+            recv = client_sock.recv
+            consume = self._consume
+            pending = b""  # Start of a message split across recv() calls
+            timeout_ms = HEARTBEAT_TIMEOUT * 1000
+            last_activity = ticks_ms()
             
             while self.running and not check_emergency_stop():
                 # Feed watchdog
-                feed_watchdog()
+                feed()
                 
                 try:
-                    # Check if data is available with select (with 1 second timeout)
-                    r, _, _ = select.select([client_sock], [], [], 1)
+                    # Check if data is available (with 1 second timeout)
+                    r = poll(1000)
                     
                     # If not running anymore, break the loop
                     if not self.running or check_emergency_stop():
                         log("TCP server shutdown requested - closing client")
                         break
                     
+                    # A newer connection is waiting for this worker
+                    if self._pending is not None:
+                        log("New node connection - closing the current one")
+                        break
+                    
                     # Process data if available
                     if r:
-                        try:
-                            data = client_sock.recv(1024)
-                            if not data:
-                                log("Node connection closed")
-                                break
-                            
-                            # Process the data
-                            message = data.decode().strip()
-                            last_activity = time.ticks_ms()
-                            
-                            # Process different message types
-                            if message.startswith("HEARTBEAT"):
-                                # Handle enhanced heartbeat with stats (HEARTBEAT:sensors/total:memory)
-                                heartbeat_parts = message.split(":", 2)
-                                if len(heartbeat_parts) >= 2:
-                                    sensor_status = heartbeat_parts[1] if len(heartbeat_parts) > 1 else "N/A"
-                                    mem_status = heartbeat_parts[2] if len(heartbeat_parts) > 2 else "N/A"
-                                    log(f"Node heartbeat - Sensors: {sensor_status}, Mem: {mem_status}", LOG_DEBUG)
-                                
-                                # Update last heartbeat time
-                                self.last_heartbeat = time.ticks_ms()
-                            elif message.startswith("LOG:"):
-                                # Strip the LOG: prefix and forward
-                                log_message = message[4:]
-                                sys.stdout.write(f"LOG:{log_message}\n")
-                                if hasattr(sys.stdout, "flush"):
-                                    sys.stdout.flush()
-                            elif message.startswith("NODE_CONNECTED"):
-                                log("Node connected and ready")
-                                
-                                # Check for protocol version
-                                if ":" in message:
-                                    version = message.split(":", 1)[1]
-                                    log(f"Node protocol version: {version}")
-                            else:
-                                # Regular response from node - could be command response
-                                log_prefix = message[:50] + "..." if len(message) > 50 else message
-                                log(f"Response from node: {log_prefix}")
-                                if len(message) > 50:
-                                    log(f"  (message length: {len(message)} chars)", LOG_DEBUG)
-                                
-                                # Forward the response to the frontend
-                                sys.stdout.write(f"LOG:[NODE] Command response: {message}\n")
-                                if hasattr(sys.stdout, "flush"):
-                                    sys.stdout.flush()
-                        except Exception as e:
-                            error_str = str(e).lower()
-                            if "eagain" in error_str or "would block" in error_str or "nonblocking" in error_str:
-                                # This is normal for non-blocking sockets (BlockingIOError equivalent)
-                                pass
-                            else:
-                                raise
+                        data = recv(1024)
+                        if not data:
+                            log("Node connection closed")
+                            break
+                        
+                        last_activity = ticks_ms()
+                        
+                        if pending:
+                            data = pending + data
+                        used = consume(data)
+                        pending = data[used:] if used < len(data) else b""
+                        if len(pending) > 1024:
+                            # No terminator in sight; pass it on rather than buffer without limit
+                            self._on_response(pending)
+                            pending = b""
                     
                     # Check for inactivity timeout (heartbeat-based)
-                    current_time = time.ticks_ms()
-                    time_since_last_activity = time.ticks_diff(current_time, last_activity)
-                    if time_since_last_activity > HEARTBEAT_TIMEOUT * 1000:
+                    time_since_last_activity = ticks_diff(ticks_ms(), last_activity)
+                    if time_since_last_activity > timeout_ms:
                         log(f"Connection timeout - no activity for {HEARTBEAT_TIMEOUT} seconds", LOG_WARNING)
                         break
                 except KeyboardInterrupt:
@@ -449,14 +654,21 @@ class TCPServer:
                     set_emergency_stop()  # Set the emergency stop flag
                     break
                 except Exception as e:
+                    if is_would_block(e):
+                        # This is normal for non-blocking sockets (BlockingIOError equivalent)
+                        continue
                     log(f"Unexpected error in client handling: {e}", LOG_ERROR)
-                    time.sleep_ms(1000)
+                    break
         except Exception as e:
             log(f"Error handling TCP client: {str(e)}", LOG_ERROR)
         finally:
-            with self.conn_lock:
-                if self.node_conn is client_sock:
-                    self.node_conn = None
+            if self.node_conn is client_sock:
+                self.node_conn = None
+            if poller is not None:
+                try:
+                    poller.unregister(client_sock)
+                except Exception:
+                    pass
                     
             try:
                 client_sock.close()
@@ -470,7 +682,7 @@ class TCPServer:
         Send a command to the node via its command server with improved reliability
         
         Args:
-            command_code: The command to send
+            command_code: The command to send, as bytes
             wait_for_response: Whether to wait for a response
             timeout_sec: Timeout in seconds for response
             
@@ -478,76 +690,135 @@ class TCPServer:
             (success, response) tuple
         """
         # Use longer timeout for initialization and sensor check commands
-        if command_code == 'I':  # Sensor initialization
+        if command_code == CMD_REINIT_SENSORS:  # Sensor initialization
             timeout_sec = 20  # Increase to 20 seconds
-        elif command_code == 'C':  # Sensor check
+        elif command_code == CMD_CHECK_SENSORS:  # Sensor check
             timeout_sec = 10  # Increase to 10 seconds
             
-        cmd_sock = None
-        try:
-            # Create a new socket for the command connection
-            cmd_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            # Use settimeout() method of the socket instance
-            cmd_sock.settimeout(timeout_sec)  # configurable timeout
+        response = None
+        for attempt in range(2):
+            # A reused connection may have been dropped by the node (e.g. after a
+            # restart); that only shows up on send/recv, so retry once on a fresh one
+            reused = self._cmd_sock is not None
+            try:
+                cmd_sock = self._command_socket()
+                # Use settimeout() method of the socket instance
+                cmd_sock.settimeout(timeout_sec)  # configurable timeout
+                
+                # Send the command
+                log("Sending command '%s' to node...", args=(command_code.decode(),))
+                cmd_sock.send(command_code)
+            except Exception as e:
+                self._close_command_socket()
+                if reused and attempt == 0:
+                    continue
+                log("Error sending command to node: %s", LOG_ERROR, args=(e,))
+                return False, f"Error: {e}"
             
-            # Connect to the node's command server
-            log(f"Connecting to node command server at {cfg.NODE_IP}:{cfg.TCP_PORT}...")
-            cmd_sock.connect((cfg.NODE_IP, cfg.TCP_PORT))
+            if not wait_for_response:
+                # Nobody reads the reply, so don't leave it queued for the next command
+                self._close_command_socket()
+                return True, "Command sent (no response requested)"
             
-            # Send the command
-            log(f"Sending command '{command_code}' to node...")
-            cmd_sock.send(command_code.encode())
+            # Wait for response
+            try:
+                response = cmd_sock.recv(4096).decode()
+            except Exception as e:
+                # Use general exception handling for better compatibility
+                self._close_command_socket()
+                log("Response error from node after command: %s - %s", LOG_WARNING, args=(command_code.decode(), e))
+                return False, "Error: {}".format(e)
+            if response:
+                break
             
-            # Wait for response if requested
-            if wait_for_response:
-                try:
-                    response = cmd_sock.recv(4096).decode()
-                    if response:
-                        # Parse structured response (format: "STATUS:message")
-                        status = "UNKNOWN"
-                        message = response
-                        
-                        if ":" in response:
-                            parts = response.split(":", 1)
-                            status = parts[0]
-                            message = parts[1] if len(parts) > 1 else ""
-                        
-                        # Handle based on status
-                        if status == "OK":
-                            log_prefix = message[:50] + "..." if len(message) > 50 else message
-                            log(f"Success response from node: {log_prefix}")
-                            # Forward the response to the frontend
-                            sys.stdout.write(f"LOG:[NODE] Command successful: {message}\n")
-                            if hasattr(sys.stdout, "flush"):
-                                sys.stdout.flush()
-                            return True, message
-                        else:
-                            log(f"Error response from node: {message}", LOG_WARNING)
-                            # Forward the error to the frontend
-                            sys.stdout.write(f"LOG:[NODE] Command failed: {message}\n")
-                            if hasattr(sys.stdout, "flush"):
-                                sys.stdout.flush()
-                            return False, message
-                    else:
-                        log(f"Empty response from node after command: {command_code}", LOG_WARNING)
-                        return False, "Empty response"
-                except Exception as e:
-                    # Use general exception handling for better compatibility
-                    log("Response error from node after command: {} - {}".format(command_code, e), LOG_WARNING)
-                    return False, "Error: {}".format(e)
-            else:
-                return True, "Command sent (no response requested)"
-                    
-        except Exception as e:
-            log(f"Error sending command to node: {str(e)}", LOG_ERROR)
-            return False, f"Error: {e}"
-        finally:
-            # Always clean up the socket in a finally block
-            if cmd_sock:
-                try:
-                    cmd_sock.close()
-                except Exception:
-                    pass
+            # Connection closed by the node
+            self._close_command_socket()
+            if not (reused and attempt == 0):
+                break
+        
+        if not response:
+            log("Empty response from node after command: %s", LOG_WARNING, args=(command_code.decode(),))
+            return False, "Empty response"
+        
+        # Parse structured response (format: "STATUS:message")
+        status = "UNKNOWN"
+        message = response
+        
+        if ":" in response:
+            parts = response.split(":", 1)
+            status = parts[0]
+            message = parts[1] if len(parts) > 1 else ""
+        
+        # Handle based on status
+        if status == "OK":
+            log_prefix = message[:50] + "..." if len(message) > 50 else message
+            log("Success response from node: %s", args=(log_prefix,))
+            # Forward the response to the frontend
+            _STDOUT_TEXT_WRITE(f"LOG:[NODE] Command successful: {message}\n")
+            _STDOUT_TEXT_FLUSH()
+            return True, message
+        else:
+            log("Error response from node: %s", LOG_WARNING, args=(message,))
+            # Forward the error to the frontend
+            _STDOUT_TEXT_WRITE(f"LOG:[NODE] Command failed: {message}\n")
+            _STDOUT_TEXT_FLUSH()
+            return False, message
+
+    def _command_socket(self):
+        """Return the persistent command connection to the node, connecting if needed"""
+        if self._cmd_sock is None:
+            cmd_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            try:
+                cmd_sock.settimeout(5)
+                # Connect to the node's command server
+                log("Connecting to node command server at %s:%d...", args=(cfg.NODE_IP, cfg.TCP_PORT))
+                cmd_sock.connect((cfg.NODE_IP, cfg.TCP_PORT))
+            except Exception:
+                cmd_sock.close()
+                raise
+            try:
+                # Commands are tiny; send them without Nagle delay
+                cmd_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except (AttributeError, OSError):
+                # Not all MicroPython implementations support this option
+                pass
+            self._cmd_sock = cmd_sock
+        return self._cmd_sock
+
+    def _close_command_socket(self):
+        """Close the command connection so the next command reconnects"""
+        if self._cmd_sock is not None:
+            try:
+                self._cmd_sock.close()
+            except Exception:
+                pass
+            self._cmd_sock = None
+
+def _parse_seq(buf, start, nbytes):
+    """Return the sequence number of the packet at buf[start:], or -1 if its header doesn't match nbytes"""
+    if nbytes < DATA_HEADER_SIZE:
+        return -1
+    # Read the two little-endian fields in place; unpack_from would allocate a tuple
+    if buf[start + 2] | (buf[start + 3] << 8) != nbytes - DATA_HEADER_SIZE:
+        return -1
+    return buf[start] | (buf[start + 1] << 8)
+
+# The viper-compiled header check lives in its own module so a firmware
+# without the native emitter can still import this file
+try:
+    from packet_check import parse_seq
+except (ImportError, SyntaxError, ValueError) as e:
+    print(f"Warning: Native packet check unavailable, using Python fallback: {e}")
+    parse_seq = _parse_seq
+
+# USB batch buffers for forwarded sensor frames, used as a ring: the receive
+# loop fills one while a writer thread sends the queued ones, so a stalled USB
+# write no longer holds up the socket. A new UDPServer is created each time
+# streaming starts, so the buffers are allocated once here and reused rather
+# than fragmenting the heap with fresh 4 KB blocks per session; only one
+# UDPServer runs at a time.
+_UDP_RING_SLOTS = const(3)
+_UDP_OUT_BUFS = tuple(bytearray(4096) for _ in range(_UDP_RING_SLOTS))
 
 class UDPServer:
     """
@@ -559,126 +830,243 @@ class UDPServer:
         self.running = True
         self.packet_count = 0
         self.last_seq = None
+        self.lost_total = 0  # Packets missing from the sequence, reported with the stats
+        self.lost_reported = 0
         self.start_time = time.ticks_ms()
         self.error_count = 0
         self.max_errors = 10
-        # Pre-allocate buffer for receiving data
-        self.recv_buffer = bytearray(4200)  # Slightly larger than expected packet size
+        # Frames are batched in a ring slot and written to USB together. Each
+        # datagram is received straight into the slot behind its "DATA:" prefix,
+        # so a packet is never copied on its way to the computer.
+        self.max_datagram = 1024  # Far larger than a sensor packet
+        self.out_views = tuple(memoryview(buf) for buf in _UDP_OUT_BUFS)
+        self.out_lens = [0] * _UDP_RING_SLOTS
+        self.out_buf = _UDP_OUT_BUFS[0]
+        self.out_view = self.out_views[0]
+        self.out_pos = 0
+        # Single producer (run) and single consumer (write_loop): run only
+        # advances ring_head and write_loop only advances ring_tail, so the
+        # counters need no lock. _writer_wake is held while there is nothing
+        # to write.
+        self.ring_head = 0
+        self.ring_tail = 0
+        self.writing = True
+        self.writer_done = False
+        self._writer_wake = _thread.allocate_lock()
+        self._writer_wake.acquire()
+        self.out_threshold = 3584
+        self.out_max_age = 5  # ms
         # Periodic stats reporting
         self.last_stats_time = time.ticks_ms()
-        self.stats_interval = 10000  # 10 seconds
+        self.stats_interval = 30000  # 30 seconds
 
     def run(self):
         """Receive and process UDP data with improved reliability and packet validation"""
         log("UDP data streaming started")
+        body = len(DATA_PREFIX)  # Offset of the received packet within its frame
         
-        while self.running and not check_emergency_stop():
+        # Local aliases keep global and attribute lookups out of the hot loop
+        ticks_ms = time.ticks_ms
+        ticks_diff = time.ticks_diff
+        sleep_ms = time.sleep_ms
+        feed = feed_watchdog
+        unpack_from = struct.unpack_from
+        out_buf = self.out_buf
+        out_view = self.out_view
+        max_datagram = self.max_datagram
+        out_threshold = self.out_threshold
+        out_since = 0
+        room_needed = body + max_datagram
+        out_size = len(out_buf)
+        flush = self.flush
+        track_sequence = self.track_sequence
+        packet_count = self.packet_count
+        try:
+            recv_into = self.udp_socket.recvfrom_into
+        except AttributeError:
+            recv_into = None
+        
+        # Sleep until a datagram arrives instead of polling the socket on a
+        # fixed delay; the wait is capped so the watchdog keeps being fed and
+        # queued frames still go out after out_max_age
+        poller = select.poll()
+        poller.register(self.udp_socket, select.POLLIN)
+        poll = poller.poll
+        idle_wait = 20  # ms
+        out_max_age = self.out_max_age
+        
+        # emergency_stop is read directly: the call to check_emergency_stop()
+        # would cost more than the flag read itself on every packet
+        while self.running and not emergency_stop:
             try:
                 # Feed watchdog
-                feed_watchdog()
+                feed()
+                
+                if not poll(out_max_age if self.out_pos else idle_wait):
+                    # Nothing arrived; send what is queued
+                    out_buf, out_view = flush()
+                    continue
+                
+                # Make room for a whole datagram behind the queued frames
+                out_pos = self.out_pos
+                if out_size - out_pos < room_needed:
+                    out_buf, out_view = flush()
+                    out_pos = 0
+                start = out_pos + body
                 
                 # Use recvfrom_into to avoid memory allocation
-                try:
-                    nbytes, addr = self.udp_socket.recvfrom_into(self.recv_buffer)
-                    if nbytes > 0:
-                        # Use the first nbytes of the buffer
-                        data = memoryview(self.recv_buffer)[:nbytes]
-                    else:
-                        continue
-                except Exception:
+                if recv_into is not None:
+                    nbytes, addr = recv_into(out_view[start:start + max_datagram])
+                else:
                     # Fallback to regular recvfrom if recvfrom_into not available
-                    data, addr = self.udp_socket.recvfrom(4096)
+                    data, addr = self.udp_socket.recvfrom(max_datagram)
+                    nbytes = len(data)
+                    out_buf[start:start + nbytes] = data
                 
-                if data:
+                if nbytes > 0:
                     # Reset error counter on successful receive
                     self.error_count = 0
                     
                     # Update statistics
-                    self.packet_count += 1
+                    packet_count += 1
                     
-                    # Parse new readable format - starts with SEQ:number
-                    try:
-                        # Convert data to string for parsing
-                        data_str = data.decode('utf-8')
+                    seq = parse_seq(out_buf, start, nbytes)
+                    if seq >= 0:
+                        track_sequence(seq)
                         
-                        # Validate packet structure
-                        if not data_str.startswith("SEQ:"):
-                            raise ValueError("Invalid packet format - missing SEQ: prefix")
-                            
-                        parts = data_str.split(',')
-                        if len(parts) < 2:
-                            raise ValueError("Incomplete packet - insufficient data")
-                        
-                        # Extract sequence number
-                        seq_part = parts[0]
+                        # Queue "DATA:" + header + payload for the computer untouched
+                        if out_pos == 0:
+                            out_since = ticks_ms()
+                        out_buf[out_pos:start] = DATA_PREFIX
+                        out_pos = start + nbytes
+                        self.out_pos = out_pos
+                        if (out_pos > out_threshold or
+                                ticks_diff(ticks_ms(), out_since) >= out_max_age):
+                            out_buf, out_view = flush()
+                    elif out_buf[start] == 0x53 and out_buf[start:start + 4] == b"SEQ:":
+                        # Text packet from a node running with DEBUG_TEXT_PACKET;
+                        # "SEQ:<n>," is read from the raw bytes without decoding.
+                        # A malformed one is skipped on its own rather than
+                        # counted as a UDP error, so debug text can't stop streaming
                         try:
-                            seq = int(seq_part.split(':')[1])
-                        except (IndexError, ValueError):
-                            raise ValueError("Invalid sequence number format")
-                            
-                        # Check for packet loss if we have a previous sequence
-                        if self.last_seq is not None:
-                            expected_seq = (self.last_seq + 1) % 65536
-                            if seq != expected_seq:
-                                lost = (seq - expected_seq) % 65536
-                                if lost > 0 and lost < 1000:  # Sanity check for reasonable loss
-                                    log("Packet loss detected: {} packets missing".format(lost), LOG_WARNING)
-                        self.last_seq = seq
-                        
-                        # Format data for better readability when displayed to user
-                        formatted_data = "QUAT_DATA: " + data_str
-                        data = formatted_data.encode('utf-8')
-                        
-                    except Exception as e:
-                        log("Error parsing sensor data: {}".format(e), LOG_DEBUG)
-                        # Continue processing - don't discard potentially valuable data
+                            head = bytes(out_view[start:start + min(nbytes, 16)])
+                            comma = head.find(b",")
+                            if comma > 4:
+                                track_sequence(int(head[4:comma]))
+                            log(bytes(out_view[start:start + nbytes]).decode('utf-8'), LOG_INFO, "NODE")
+                        except ValueError:  # Also covers UnicodeError
+                            log("Malformed text packet: %d bytes", LOG_DEBUG, args=(nbytes,))
+                    else:
+                        plen = unpack_from(DATA_HEADER_FORMAT, out_buf, start)[1] if nbytes >= DATA_HEADER_SIZE else -1
+                        log("Invalid packet: %d bytes, header length %d", LOG_DEBUG, args=(nbytes, plen))
                     
                     # Log statistics periodically
-                    current_time = time.ticks_ms()
-                    if time.ticks_diff(current_time, self.last_stats_time) >= self.stats_interval:
-                        elapsed = time.ticks_diff(current_time, self.start_time) / 1000
-                        rate = self.packet_count / elapsed if elapsed > 0 else 0
-                        log(f"UDP stats: {self.packet_count} packets received, {rate:.1f} packets/sec")
+                    current_time = ticks_ms()
+                    if ticks_diff(current_time, self.last_stats_time) >= self.stats_interval:
+                        self.packet_count = packet_count
+                        elapsed = ticks_diff(current_time, self.start_time) / 1000
+                        rate = packet_count / elapsed if elapsed > 0 else 0
+                        log("UDP stats: %d packets received, %.1f packets/sec", args=(packet_count, rate))
+                        lost = self.lost_total - self.lost_reported
+                        if lost:
+                            log("Packet loss detected: %d packets missing (%d total)", LOG_WARNING,
+                                args=(lost, self.lost_total))
+                            self.lost_reported = self.lost_total
                         self.last_stats_time = current_time
-                        
-                        # Run GC during stats to minimize impact on streaming
-                        gc.collect()
-                    
-                    # Writing binary sensor data directly to the computer with DATA: prefix
-                    try:
-                        sys.stdout.buffer.write(b"DATA:")
-                        sys.stdout.buffer.write(data)
-                        if hasattr(sys.stdout.buffer, "flush"):
-                            sys.stdout.buffer.flush()
-                    except Exception as e:
-                        log(f"Error writing UDP data to stdout: {e}", LOG_ERROR)
             except Exception as e:
                 error_str = str(e).lower()
-                if "eagain" in error_str or "would block" in error_str or "nonblocking" in error_str:
-                    # No data available; avoid busy loop (BlockingIOError equivalent in MicroPython)
-                    time.sleep_ms(10)
+                if is_would_block(e):
+                    # Woken without a datagram to read (BlockingIOError equivalent
+                    # in MicroPython); send what is queued and wait again
+                    out_buf, out_view = flush()
                 elif "timeout" in error_str:
                     # Handle timeout more gracefully - this can happen and isn't always fatal
                     log("UDP socket timeout - will continue trying", LOG_DEBUG)
-                    time.sleep_ms(50)
+                    sleep_ms(50)
                 else:
                     # Count other errors
                     self.error_count += 1
                     if self.error_count > self.max_errors:
-                        log("Too many UDP errors ({}), stopping: {}".format(self.error_count, e), LOG_ERROR)
+                        log("Too many UDP errors (%d), stopping: %s", LOG_ERROR, args=(self.error_count, e))
                         break
                     else:
                         # Log other errors but continue
-                        log("UDP error ({}/{}): {}".format(self.error_count, self.max_errors, e), LOG_WARNING)
+                        log("UDP error (%d/%d): %s", LOG_WARNING, args=(self.error_count, self.max_errors, e))
                         time.sleep_ms(100)
         
-        log(f"UDP server stopped after receiving {self.packet_count} packets")
+        self.packet_count = packet_count
+        self.flush()
+        # Let the writer send the last batch and exit
+        self.writing = False
+        self._wake_writer()
+        log("UDP server stopped after receiving %d packets, %d lost", args=(packet_count, self.lost_total))
+
+    def track_sequence(self, seq):
+        """Count packets lost since the previous sequence number"""
+        if self.last_seq is not None:
+            lost = (seq - self.last_seq - 1) & 0xFFFF
+            if 0 < lost < 1000:  # Sanity check for reasonable loss
+                # Only counted here; the total is logged with the periodic stats
+                # so a lossy link doesn't add a log line per packet
+                self.lost_total += lost
+        self.last_seq = seq
+
+    def flush(self):
+        """Queue the frames batched so far for the writer; returns the (buffer, view) to fill next"""
+        if self.out_pos:
+            head = self.ring_head
+            self.out_lens[head % _UDP_RING_SLOTS] = self.out_pos
+            head += 1
+            self.ring_head = head
+            self.out_pos = 0
+            self._wake_writer()
+            
+            # The next slot is refilled only once the writer has sent it
+            while head - self.ring_tail >= _UDP_RING_SLOTS and not self.writer_done:
+                feed_watchdog()
+                time.sleep_ms(1)
+            self.out_buf = _UDP_OUT_BUFS[head % _UDP_RING_SLOTS]
+            self.out_view = self.out_views[head % _UDP_RING_SLOTS]
+        return self.out_buf, self.out_view
+
+    def _wake_writer(self):
+        """Wake write_loop if it is waiting; only the writer ever takes the lock"""
+        if self._writer_wake.locked():
+            self._writer_wake.release()
+
+    def write_loop(self):
+        """Write queued batches to the computer, one USB write per batch"""
+        views = self.out_views
+        lens = self.out_lens
+        wake = self._writer_wake
+        try:
+            while True:
+                wake.acquire()
+                while self.ring_tail != self.ring_head:
+                    i = self.ring_tail % _UDP_RING_SLOTS
+                    try:
+                        _STDOUT_WRITE(views[i][:lens[i]])
+                        _STDOUT_FLUSH()
+                    except Exception as e:
+                        log("Error writing UDP data to stdout: %s", LOG_ERROR, args=(e,))
+                    self.ring_tail += 1
+                # run() may queue its last batch after the drain above but
+                # before clearing writing, so only stop once nothing is queued
+                if not self.writing and self.ring_tail == self.ring_head:
+                    break
+        finally:
+            self.writer_done = True
 
     def stop(self):
         """Stop the UDP server safely"""
         self.running = False
-        # Give time for the thread to finish naturally
+        # Give time for the threads to finish naturally; run() queues the last
+        # batch itself, then the writer sends it and exits
         time.sleep_ms(200)
+        for _ in range(40):
+            if self.writer_done:
+                break
+            time.sleep_ms(25)
 
 class CommandHandler:
     """
@@ -692,18 +1080,34 @@ class CommandHandler:
         self.running = True
         # Flag to signal a clean exit
         self.exit_requested = False
+        # Held while the status thread sleeps; released by its timer and on exit
+        self.status_wake = _thread.allocate_lock()
+        self.status_wake.acquire()
+        
+        # Commands arrive on stdin as lines; a poller registered once wakes the
+        # reader, and bytes collect in a preallocated line buffer
+        self._stdin = getattr(sys.stdin, "buffer", sys.stdin)
+        self._poll = select.poll()
+        self._poll.register(sys.stdin, select.POLLIN)
+        self._rx = bytearray(256)  # Longest accepted command line
+        self._rx_mv = memoryview(self._rx)
+        self._rx_len = 0
+        self._rx_byte = bytearray(1)  # Each read lands here, one byte at a time
         
-        # Command dictionary for better modularity
+        # Command dictionary for better modularity, keyed by the raw command bytes.
+        # The bound methods are created once here, and a lookup is one hash of a
+        # short bytes key; commands arrive at human rates, so an if/elif chain
+        # (or native code, see run()) would buy nothing.
         self.commands = {
-            'S': self.start_streaming,
-            'X': self.stop_streaming,
-            'N': self.restart_node,
-            'R': self.restart_receiver,
-            'C': self.check_sensors,
-            'I': self.reinitialize_sensors,
-            'Q': self.quit_receiver,
-            'D': self.set_debug_mode,
-            'P': self.ping_node
+            CMD_START_STREAMING: self.start_streaming,
+            CMD_STOP_STREAMING: self.stop_streaming,
+            CMD_RESTART_NODE: self.restart_node,
+            CMD_RESTART_RECEIVER: self.restart_receiver,
+            CMD_CHECK_SENSORS: self.check_sensors,
+            CMD_REINIT_SENSORS: self.reinitialize_sensors,
+            CMD_QUIT: self.quit_receiver,
+            CMD_DEBUG: self.set_debug_mode,
+            CMD_PING: self.ping_node
         }
 
     def start_streaming(self, params=None):
@@ -711,20 +1115,22 @@ class CommandHandler:
         # Start sensor data: create and start UDP server.
         if self.udp_server is None:
             if self.network_manager.create_udp_socket():
+                # Start from a clean heap, before the node starts sending, so
+                # the first collection comes as late as possible into the stream
+                reset_gc_threshold()
                 # First send the command to the node to start sending data
                 success, response = self.tcp_server.send_to_node(CMD_START_STREAMING)
                 if success:
                     # Then start our UDP server to receive it
                     self.udp_server = UDPServer(self.network_manager.udp_socket)
-                    _thread.start_new_thread(self.udp_server.run, ())
+                    _thread.start_new_thread(self.udp_server.write_loop, ())
+                    start_thread_with_stack(self.udp_server.run, (), cfg.UDP_THREAD_STACK)
                     log("UDP server started for sensor data.")
                     return True
                 else:
                     log(f"Failed to send start command to node: {response}", LOG_ERROR)
                     # Clean up the socket we just created
-                    if self.network_manager.udp_socket:
-                        self.network_manager.udp_socket.close()
-                        self.network_manager.udp_socket = None
+                    self.teardown_udp()
                     return False
             else:
                 log("Failed to create UDP server.", LOG_ERROR)
@@ -739,22 +1145,29 @@ class CommandHandler:
         self.tcp_server.send_to_node(CMD_STOP_STREAMING)
         
         # Then stop our UDP server
-        if self.udp_server:
+        if self.teardown_udp():
+            log("UDP server stopped.")
+        else:
+            log("UDP server was not running.")
+        flush_log()
+        return True
+
+    def teardown_udp(self):
+        """Stop the UDP server and close its socket; returns True if either was open"""
+        was_running = self.udp_server is not None
+        if was_running:
             self.udp_server.stop()
             self.udp_server = None
-            
-        # Close the socket
-        if self.network_manager.udp_socket:
+        
+        sock = self.network_manager.udp_socket
+        if sock:
             try:
-                self.network_manager.udp_socket.close()
+                sock.close()
             except Exception:
                 pass
             self.network_manager.udp_socket = None
-            log("UDP server stopped.")
-            return True
-        else:
-            log("UDP server was not running.")
-            return True
+            was_running = True
+        return was_running
 
     def restart_node(self, params=None):
         """Restart node command"""
@@ -764,15 +1177,7 @@ class CommandHandler:
             log("Restart command sent to node.")
             
             # If we were streaming, stop the UDP server
-            if self.udp_server:
-                self.udp_server.stop()
-                self.udp_server = None
-                if self.network_manager.udp_socket:
-                    try:
-                        self.network_manager.udp_socket.close()
-                    except Exception:
-                        pass
-                    self.network_manager.udp_socket = None
+            self.teardown_udp()
             return True
         else:
             log(f"Failed to send restart command to node: {response}", LOG_ERROR)
@@ -858,6 +1263,8 @@ class CommandHandler:
         # Set flags for orderly shutdown
         self.exit_requested = True
         self.running = False
+        if self.status_wake.locked():
+            self.status_wake.release()
         
         # Set emergency stop flag
         set_emergency_stop()
@@ -880,11 +1287,10 @@ class CommandHandler:
                     # Set receiver's log level
                     with log_level_lock:
                         current_log_level = level
-                    modes = ["DEBUG", "INFO", "WARNING", "ERROR"]
-                    log_msg = f"Receiver log level set to {modes[level]}"
+                    log_msg = f"Receiver log level set to {_LOG_LEVEL_NAMES[level]}"
 
                     # Send command to node and wait for response
-                    success, node_response = self.tcp_server.send_to_node(f"D:{level}", wait_for_response=True)
+                    success, node_response = self.tcp_server.send_to_node(CMD_DEBUG + b":" + str(level).encode(), wait_for_response=True)
                     
                     if success:
                         log_msg += f" | Node: {node_response}"
@@ -900,7 +1306,7 @@ class CommandHandler:
                 # Return current log level
                 with log_level_lock:
                     level = current_log_level
-                log(f"Current receiver log level: {['DEBUG', 'INFO', 'WARNING', 'ERROR'][level]}")
+                log("Current receiver log level: %s", args=(_LOG_LEVEL_NAMES[level],))
                 return True
         except Exception as e:
             log(f"Error setting debug mode: {e}", LOG_ERROR)
@@ -921,20 +1327,21 @@ class CommandHandler:
         """
         Process commands with command pattern implementation and validation
         Args:
-            cmd: Command string (can be structured with params using colon separator)
+            cmd: Command bytes (can be structured with params using colon separator)
         """
         # Validate command length
         if not cmd or len(cmd) > 100:  # Reasonable command length limit
             log(f"Invalid command length: {len(cmd) if cmd else 0}", LOG_WARNING)
             return
             
-        log(f"Processing command: {cmd}")
+        log("Processing command: %s", args=(cmd.decode(),))
         
         try:
-            # Parse command and parameters
-            cmd_parts = cmd.split(':', 1)
-            cmd_code = cmd_parts[0].upper()
-            params = cmd_parts[1] if len(cmd_parts) > 1 else None
+            # Parse command and parameters on the raw bytes; only the code is
+            # case-folded and only parameters are decoded
+            cmd_code, sep, params = cmd.partition(b':')
+            cmd_code = cmd_code.upper()
+            params = params.decode() if sep else None
             
             # Look up command handler
             handler = self.commands.get(cmd_code)
@@ -946,68 +1353,90 @@ class CommandHandler:
                 # Execute the command handler
                 success = handler(params)
                 if success:
-                    log(f"Command {cmd_code} executed successfully")
+                    log("Command %s executed successfully", args=(cmd_code.decode(),))
                 else:
-                    log(f"Command {cmd_code} failed", LOG_WARNING)
+                    log("Command %s failed", LOG_WARNING, args=(cmd_code.decode(),))
             else:
-                log(f"Unknown command received: {cmd}", LOG_WARNING)
+                log("Unknown command received: %s", LOG_WARNING, args=(cmd.decode(),))
                 
         except Exception as e:
-            log(f"Error processing command {cmd}: {e}", LOG_ERROR)
+            log("Error processing command %s: %s", LOG_ERROR, args=(cmd, e))
             # Don't reraise - keep running even after errors
 
     def run(self):
         """Read commands from CDC USB (STDIN) more reliably with watchdog feeding and buffer size limits"""
+        # Deliberately left as bytecode rather than @micropython.native: the
+        # decorator is resolved when main.py is compiled, so firmware without the
+        # native emitter could not load the receiver at all, and this loop spends
+        # nearly all of its time blocked in poll(). Native code lives in separate
+        # modules with a Python fallback (see packet_check.py).
         # Flush any existing input to prevent residual data
         self.flush_input()
-        buffer = ""
-        MAX_BUFFER_SIZE = 256  # Prevent buffer overflow attacks
         
-        while self.running and not check_emergency_stop():
+        # Read raw bytes so commands need no decoding before dispatch
+        stdin = self._stdin
+        poll = self._poll.poll
+        rx = self._rx
+        rx_mv = self._rx_mv
+        rx_size = len(rx)
+        rx_byte = self._rx_byte
+        readinto = stdin.readinto
+        sleep_ms = time.sleep_ms
+        feed = feed_watchdog
+        stopped = check_emergency_stop
+        process_command = self.process_command
+        
+        while self.running and not stopped():
             try:
                 # Feed watchdog
-                feed_watchdog()
+                feed()
+                
+                # Block until input arrives (up to 100 ms so the watchdog stays
+                # fed); while bytes are waiting this returns at once, so each
+                # byte costs one poll and one single-byte read
+                if not poll(100):
+                    continue
                 
-                # Direct character-by-character reading approach
-                if sys.stdin in select.select([sys.stdin], [], [], 0.1)[0]:
-                    char = sys.stdin.read(1)
-                    if char:
-                        if char == '\n' or char == '\r':
-                            if buffer:
-                                cmd = buffer.strip().upper()
-                                log(f"Received command from controller: {cmd}")
-                                buffer = ""
-                                self.process_command(cmd)
-                        else:
-                            # Prevent buffer overflow
-                            if len(buffer) < MAX_BUFFER_SIZE:
-                                buffer += char
-                            else:
-                                log("Command buffer overflow - resetting", LOG_WARNING)
-                                buffer = ""
+                # A wake without data (or a HUP/ERR event) reads nothing; wait
+                # for the next poll rather than reuse a stale byte
+                if readinto(rx_byte) != 1:
+                    sleep_ms(10)
+                    continue
+                byte = rx_byte[0]
+                n = self._rx_len
+                if byte == 0x0A or byte == 0x0D:  # '\n' or '\r'
+                    if n:
+                        cmd = bytes(rx_mv[:n]).strip()
+                        n = 0
+                        log("Received command from controller: %s", args=(cmd.decode(),))
+                        process_command(cmd)
+                else:
+                    rx[n] = byte
+                    n += 1
+                    # Prevent buffer overflow
+                    if n == rx_size:
+                        log("Command buffer overflow - resetting", LOG_WARNING)
+                        n = 0
+                self._rx_len = n
             except Exception as e:
+                self._rx_len = 0
                 log(f"Error in command handler: {e}", LOG_ERROR)
-            
-            # Short sleep to prevent CPU hogging
-            time.sleep_ms(10)
     
     def flush_input(self):
         """Flush any pending input from stdin"""
         try:
-            while True:
-                # Check if there's data to read without blocking
-                r, _, _ = select.select([sys.stdin], [], [], 0)
-                if sys.stdin in r:
-                    # Read and discard the data
-                    sys.stdin.read(1)
-                else:
+            # Read and discard whatever is already waiting
+            while self._poll.poll(0):
+                if self._stdin.readinto(self._rx_byte) != 1:
                     break
+            self._rx_len = 0
         except Exception as e:
-            log(f"Error flushing input: {e}", LOG_DEBUG)
+            log("Error flushing input: %s", LOG_DEBUG, args=(e,))
 
 def start_tcp_server(network_manager):
     """Start TCP server in a thread"""
     tcp_server = TCPServer(network_manager.tcp_socket)
+    _thread.start_new_thread(tcp_server.client_worker, ())
     _thread.start_new_thread(tcp_server.run, ())
     return tcp_server
 
@@ -1018,29 +1447,29 @@ def start_command_handler(tcp_server, network_manager):
     return cmd_handler
 
 def system_status_thread(tcp_server, network_manager, cmd_handler):
-    """Periodically check and report system status using a timer approach with memory monitoring"""
+    """Periodically check and report system status with memory monitoring"""
     start_time = time.ticks_ms()
+    status_timer = None
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+    mem_free = gc.mem_free
     
     try:
-        def report_status(timer):
-            if cmd_handler.exit_requested or check_emergency_stop():
-                if hasattr(timer, 'deinit'):
-                    timer.deinit()  # Stop the timer if exit requested
-                return
-                
+        def report_status():
             try:
                 # Feed watchdog
                 feed_watchdog()
                 
                 # Check memory and force GC if needed
-                free_mem = gc.mem_free()
+                free_mem = mem_free()
                 if free_mem < 20000:  # 20KB threshold
-                    log(f"Low memory: {free_mem} bytes free, running garbage collection", LOG_WARNING)
+                    log("Low memory: %d bytes free, running garbage collection", LOG_WARNING, args=(free_mem,))
                     gc.collect()
-                    free_mem = gc.mem_free()  # Get updated value
+                    free_mem = mem_free()  # Get updated value
                 
                 # Calculate uptime
-                uptime_ms = time.ticks_diff(time.ticks_ms(), start_time)
+                now = ticks_ms()
+                uptime_ms = ticks_diff(now, start_time)
                 uptime_sec = uptime_ms // 1000
                 uptime_min = uptime_sec // 60
                 uptime_hr = uptime_min // 60
@@ -1056,56 +1485,67 @@ def system_status_thread(tcp_server, network_manager, cmd_handler):
                 
                 # Calculate time since last heartbeat
                 heartbeat_age = "Never"
-                if tcp_server.last_heartbeat > 0:
-                    age_sec = time.ticks_diff(time.ticks_ms(), tcp_server.last_heartbeat) // 1000
-                    heartbeat_age = f"{age_sec}s ago"
+                last_heartbeat = tcp_server.last_heartbeat
+                if last_heartbeat > 0:
+                    heartbeat_age = "%ds ago" % (ticks_diff(now, last_heartbeat) // 1000)
                 
                 # Log the status
-                log(f"STATUS: Uptime: {int(uptime_hr)}h {int(uptime_min%60)}m {int(uptime_sec%60)}s | "
-                    f"WiFi AP: {wifi_status} | Node: {node_status} | "
-                    f"UDP: {udp_status} | Last HB: {heartbeat_age} | Free Mem: {free_mem}")
-                    
-                # Run garbage collection
-                gc.collect()
+                log(_STATUS_FMT, args=(uptime_hr, uptime_min % 60, uptime_sec % 60, wifi_status,
+                                       node_status, udp_status, heartbeat_age, free_mem))
                 
             except Exception as e:
                 log(f"Error in status thread: {e}", LOG_ERROR)
                 
-        # Use a timer for more precise timing if available
-        try:
-            # Create a timer that triggers every 60 seconds
-            status_timer = machine.Timer(-1)
-            status_timer.init(period=60000, mode=machine.Timer.PERIODIC, callback=report_status)
-            
-            # Initial status report
-            report_status(None)
-            
-            # Keep this thread alive but with minimal resource usage
-            while not cmd_handler.exit_requested and not check_emergency_stop():
-                time.sleep_ms(1000)
-                feed_watchdog()
-                
-            # Clean up timer
-            if hasattr(status_timer, 'deinit'):
-                status_timer.deinit()
+        # Prefer a hardware timer: its callback releases status_wake once a
+        # minute and quit_receiver releases it on exit, so the thread sleeps until
+        # there is something to do (the main loop keeps the watchdog fed)
+        wake = cmd_handler.status_wake
+        if cfg.STATUS_TIMER_ID is not None:
+            try:
+                def release_wake(timer):
+                    if wake.locked():
+                        wake.release()
                 
-        except Exception:
-            # Fallback to basic sleep loop if Timer is not available
+                status_timer = machine.Timer(cfg.STATUS_TIMER_ID)
+                status_timer.init(period=60000, mode=machine.Timer.PERIODIC, callback=release_wake)
+            except Exception as e:
+                log(f"Status timer unavailable, polling instead: {e}", LOG_WARNING)
+                status_timer = None
+        
+        if status_timer:
+            report_status()
+            while True:
+                wake.acquire()
+                if cmd_handler.exit_requested or check_emergency_stop():
+                    break
+                report_status()
+        else:
+            # Report once a minute against a ticks deadline, waking at most every
+            # 5 s (well inside the watchdog timeout) to feed it and check for exit
+            ticks_add = time.ticks_add
+            sleep_ms = time.sleep_ms
+            feed = feed_watchdog
+            next_report = ticks_ms()
             while not cmd_handler.exit_requested and not check_emergency_stop():
-                report_status(None)  # Use the same function with None as timer
-                
-                # Sleep in smaller chunks to respond to exit request faster
-                for _ in range(60):
-                    if cmd_handler.exit_requested or check_emergency_stop():
-                        break
-                    time.sleep_ms(1000)
-                    feed_watchdog()
+                remaining = ticks_diff(next_report, ticks_ms())
+                if remaining <= 0:
+                    report_status()
+                    next_report = ticks_add(ticks_ms(), 60000)
+                    continue
+                feed()
+                sleep_ms(min(5000, remaining))
     
     except KeyboardInterrupt:
         log("Keyboard interrupt in status thread", LOG_WARNING)
         set_emergency_stop()  # Set the emergency stop flag
     except Exception as e:
         log(f"Error in status thread: {e}", LOG_ERROR)
+    finally:
+        if status_timer:
+            try:
+                status_timer.deinit()
+            except Exception:
+                pass
 
 def cleanup_resources(tcp_server, network_manager, cmd_handler):
     """
@@ -1123,59 +1563,39 @@ def cleanup_resources(tcp_server, network_manager, cmd_handler):
         except Exception:
             pass
     
-    # Stop sensor reading if active
-    if cmd_handler and hasattr(cmd_handler, 'udp_server') and cmd_handler.udp_server:
+    # Stop sensor reading if active and close its socket (the UDP socket only
+    # exists once the command handler has started streaming)
+    if cmd_handler:
         try:
-            cmd_handler.udp_server.stop()
-            log("UDP server stopped")
+            if cmd_handler.teardown_udp():
+                log("UDP server stopped")
         except Exception as e:
-            log(f"Error stopping UDP server: {e}", LOG_DEBUG)
-        cmd_handler.udp_server = None
-    
-    # Close UDP socket
-    if network_manager and hasattr(network_manager, 'udp_socket') and network_manager.udp_socket:
-        try:
-            network_manager.udp_socket.close()
-            log("UDP socket closed")
-        except Exception as e:
-            log(f"Error closing UDP socket: {e}", LOG_DEBUG)
-        network_manager.udp_socket = None
+            log("Error stopping UDP server: %s", LOG_DEBUG, args=(e,))
     
     # Stop the TCP server
     if tcp_server:
         try:
-            if hasattr(tcp_server, 'stop'):
-                tcp_server.stop()
-            else:
-                if hasattr(tcp_server, 'running'):
-                    tcp_server.running = False
-                
-                if hasattr(tcp_server, 'node_conn') and tcp_server.node_conn:
-                    try:
-                        tcp_server.node_conn.close()
-                    except Exception:
-                        pass
-                    tcp_server.node_conn = None
+            tcp_server.stop()
             log("TCP server stopped")
         except Exception as e:
-            log(f"Error stopping TCP server: {e}", LOG_DEBUG)
+            log("Error stopping TCP server: %s", LOG_DEBUG, args=(e,))
     
     # Close TCP socket
-    if network_manager and hasattr(network_manager, 'tcp_socket') and network_manager.tcp_socket:
+    if network_manager and network_manager.tcp_socket:
         try:
             network_manager.tcp_socket.close()
             log("TCP socket closed")
         except Exception as e:
-            log(f"Error closing TCP socket: {e}", LOG_DEBUG)
+            log("Error closing TCP socket: %s", LOG_DEBUG, args=(e,))
         network_manager.tcp_socket = None
     
     # Stop AP if active
-    if network_manager and hasattr(network_manager, 'ap'):
+    if network_manager:
         try:
             network_manager.ap.active(False)
             log("WiFi AP deactivated")
         except Exception as e:
-            log(f"Error deactivating AP: {e}", LOG_DEBUG)
+            log("Error deactivating AP: %s", LOG_DEBUG, args=(e,))
     
     # Run garbage collection
     gc.collect()
@@ -1196,6 +1616,13 @@ def cleanup_resources(tcp_server, network_manager, cmd_handler):
     log("Resources cleaned up")
     return True
 
+def _force_exit(tcp_server, network_manager, cmd_handler):
+    """Stop everything after a Ctrl+C and drop back to the REPL"""
+    print(_BANNER_EXIT)
+    set_emergency_stop()
+    cleanup_resources(tcp_server, network_manager, cmd_handler)
+    sys.exit(0)
+
 def safe_mode():
     """
     Enter safe mode with minimal functionality for diagnostics with state preservation
@@ -1250,6 +1677,9 @@ def safe_mode():
 
 def main():
     """Main function with improved error handling and recovery"""
+    # Lets exceptions raised in the status timer callback carry a traceback
+    micropython.alloc_emergency_exception_buf(128)
+    
     print("\n" * 2)
     print("============================================")
     print("MOTION CAPTURE RECEIVER - STARTING")
@@ -1327,9 +1757,18 @@ def main():
                 log("Use 'Q' command for clean exit")
                 
                 # Main thread's health monitoring loop
+                feed = feed_watchdog
+                ap_active = net_mgr.ap.active
+                mem_free = gc.mem_free
+                sleep_ms = time.sleep_ms
+                ticks_ms = time.ticks_ms
+                ticks_diff = time.ticks_diff
+                # The AP state rarely changes, so only ask the WiFi driver every 10 s
+                ap_poll_interval = 10000
+                next_ap_poll = time.ticks_add(ticks_ms(), ap_poll_interval)
                 while not exit_requested and not check_emergency_stop():
                     # Feed watchdog
-                    feed_watchdog()
+                    feed()
                     
                     # Check if exit was requested through command
                     if cmd_handler.exit_requested:
@@ -1338,37 +1777,29 @@ def main():
                         break
                     
                     # Check AP status periodically
-                    if not net_mgr.ap.active():
-                        if not exit_requested and not check_emergency_stop():
-                            log("WiFi AP has stopped. Restarting...", LOG_WARNING)
-                            break
+                    now = ticks_ms()
+                    if ticks_diff(now, next_ap_poll) >= 0:
+                        next_ap_poll = time.ticks_add(now, ap_poll_interval)
+                        if not ap_active():
+                            if not exit_requested and not check_emergency_stop():
+                                log("WiFi AP has stopped. Restarting...", LOG_WARNING)
+                                break
                     
                     # Memory monitoring in main thread
-                    free_mem = gc.mem_free()
+                    free_mem = mem_free()
                     if free_mem < 10000:  # Critical memory threshold in main thread
-                        log(f"CRITICAL LOW MEMORY: {free_mem} bytes - forcing GC", LOG_ERROR)
+                        log("CRITICAL LOW MEMORY: %d bytes - forcing GC", LOG_ERROR, args=(free_mem,))
                         gc.collect()
                     
-                    # Run garbage collection occasionally
-                    if time.ticks_ms() % 60000 < 1000:  # roughly once per minute
-                        gc.collect()
-                        
-                    time.sleep_ms(1000)  # Check health every second
+                    # No fixed-cadence collection here: gc.threshold() triggers it
+                    # by allocation volume, so a streaming session isn't paused
+                    # once a minute for nothing
                     
-            except KeyboardInterrupt:
-                # Clean shutdown on CTRL+C
-                print("\n" * 3)
-                print("============================================")
-                print("KEYBOARD INTERRUPT DETECTED - FORCING EXIT")
-                print("============================================")
-                
-                # Set emergency stop flag
-                set_emergency_stop()
-                
-                # Clean up resources
-                cleanup_resources(tcp_server, net_mgr, cmd_handler)
-                break
-                
+                    # Push out log lines log() held back
+                    flush_log()
+                    sleep_ms(1000)  # Check health every second
+                    
+            # CTRL+C is handled once, by the outer handler below
             except Exception as e:
                 if not exit_requested and not check_emergency_stop():
                     log(f"Unexpected error in main loop: {e}", LOG_ERROR)
@@ -1382,17 +1813,7 @@ def main():
                     break
     
     except KeyboardInterrupt:
-        # Final KeyboardInterrupt handler
-        print("\n" * 3)
-        print("============================================")
-        print("KEYBOARD INTERRUPT DETECTED - FORCING EXIT")
-        print("============================================")
-        
-        # Set emergency stop flag
-        set_emergency_stop()
-        
-        # Clean up resources
-        cleanup_resources(tcp_server, net_mgr, cmd_handler)
+        _force_exit(tcp_server, net_mgr, cmd_handler)
     
     # Final cleanup
     cleanup_resources(tcp_server, net_mgr, cmd_handler)
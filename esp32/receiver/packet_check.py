@@ -0,0 +1,16 @@
+# packet_check.py Viper-compiled sensor packet header check for the receiver.
+# Kept in its own module so that main.py can fall back to a pure-Python
+# version on firmware built without the native code emitter.
+
+import micropython
+
+
+@micropython.viper
+def parse_seq(buf: ptr8, start: int, nbytes: int) -> int:
+    """Return the sequence number of the packet at buf[start:], or -1 if its header doesn't match nbytes"""
+    if nbytes < 4:
+        return -1
+    plen = buf[start + 2] | (buf[start + 3] << 8)
+    if plen != nbytes - 4:
+        return -1
+    return buf[start] | (buf[start + 1] << 8)
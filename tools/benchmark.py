@@ -2,9 +2,18 @@
 import serial
 import time
 import argparse
+import struct
 import sys
 from collections import deque
 
+# Sensor packets arrive as b"DATA:" + little-endian (sequence, payload length)
+# header + w, x, y, z int16 per sensor in 1/16384 units
+DATA_PREFIX = b"DATA:"
+DATA_HEADER_FORMAT = '<HH'
+DATA_HEADER_SIZE = 4
+MAX_PAYLOAD_SIZE = 1024
+QUAT_SCALE = 1.0 / 16384
+
 class SensorBenchmark:
     def __init__(self, port, baud_rate=115200, window_size=5):
         self.port = port
@@ -91,16 +100,10 @@ class SensorBenchmark:
         jitter = sum(abs(i - avg_interval) for i in self.intervals) / len(self.intervals)
         return jitter * 1000  # Convert to ms
     
-    def parse_quaternion_data(self, data_str):
-        """Parse quaternion data and update sensor statistics"""
+    def parse_quaternion_data(self, packet):
+        """Parse a binary sensor packet and update sensor statistics"""
         try:
-            # Extract sequence number
-            if not data_str.startswith("SEQ:"):
-                return False
-                
-            parts = data_str.split(',')
-            seq_str = parts[0]
-            seq = int(seq_str.split(':')[1])
+            seq, payload_len = struct.unpack_from(DATA_HEADER_FORMAT, packet, 0)
             
             # Check for packet loss
             if self.last_seq is not None:
@@ -111,22 +114,13 @@ class SensorBenchmark:
                         self.missing_packets += lost
             self.last_seq = seq
             
-            # Count sensors
-            for i in range(8):
-                sensor_key = f"S{i}:"
-                for part in parts:
-                    if part.startswith(sensor_key):
-                        self.sensor_stats[i]["count"] += 1
-                        
-                        # Validate quaternion data
-                        try:
-                            quat_str = part.split(':')[1].strip('[]')
-                            quat_values = [float(x) for x in quat_str.split(',')]
-                            if len(quat_values) != 4:
-                                self.sensor_stats[i]["errors"] += 1
-                        except:
-                            self.sensor_stats[i]["errors"] += 1
-                        break
+            # Count sensors, a quaternion far outside unit length is an error
+            quats = struct.unpack_from(f"<{payload_len // 2}h", packet, DATA_HEADER_SIZE)
+            for i in range(min(8, payload_len // 8)):
+                w, x, y, z = (v * QUAT_SCALE for v in quats[i * 4:i * 4 + 4])
+                self.sensor_stats[i]["count"] += 1
+                if abs(w * w + x * x + y * y + z * z - 1.0) > 0.1:
+                    self.sensor_stats[i]["errors"] += 1
             
             return True
         except Exception as e:
@@ -151,8 +145,8 @@ class SensorBenchmark:
         self.start_time = time.time()
         end_time = self.start_time + duration
         
-        # Buffer for partial data
-        buffer = b""
+        # Buffer for partial data, grown and trimmed in place
+        buffer = bytearray()
         debug_printed = False
         
         try:
@@ -183,23 +177,29 @@ class SensorBenchmark:
                     start_pos = buffer.find(b"DATA:")
                     
                     # Remove data before start position
-                    buffer = buffer[start_pos:]
+                    del buffer[:start_pos]
                     
                     # Skip the "DATA:" prefix
-                    data_start = 5  # Length of "DATA:"
+                    data_start = len(DATA_PREFIX)
                     
-                    # Try to find the end of this packet (the start of the next one)
-                    next_packet = buffer.find(b"DATA:", data_start)
-                    
-                    if next_packet == -1:
+                    # Wait for the header, then for the payload length it announces
+                    if len(buffer) < data_start + DATA_HEADER_SIZE:
+                        break
+                    payload_len = struct.unpack_from(DATA_HEADER_FORMAT, buffer, data_start)[1]
+                    if payload_len > MAX_PAYLOAD_SIZE:
+                        # Not a real header, resync on the next marker
+                        del buffer[:data_start]
+                        continue
+                    packet_end = data_start + DATA_HEADER_SIZE + payload_len
+                    if len(buffer) < packet_end:
                         # Incomplete packet, wait for more data
                         break
                     
                     # Extract the complete packet
-                    packet = buffer[data_start:next_packet]
+                    packet = bytes(buffer[data_start:packet_end])
                     
                     # Update buffer
-                    buffer = buffer[next_packet:]
+                    del buffer[:packet_end]
                     
                     # Process the packet
                     now = time.time()
@@ -212,15 +212,7 @@ class SensorBenchmark:
                         self.intervals.append(interval)
                     self.last_packet_time = now
                     
-                    # Parse quaternion data if it's in the expected format
-                    try:
-                        data_str = packet.decode('utf-8')
-                        if data_str.startswith("QUAT_DATA:"):
-                            quat_data = data_str[10:]  # Skip "QUAT_DATA: "
-                            self.parse_quaternion_data(quat_data)
-                    except UnicodeDecodeError:
-                        # Binary packet - would need specific parsing
-                        pass
+                    self.parse_quaternion_data(packet)
                 
                 # Calculate and display stats every second
                 current_rate = self.calculate_rate()
@@ -93,23 +93,11 @@ console.log(`
 └─────────────────────────────────────────────────────────────┘
 `);
 
-// Parse sensor data to extract sequence number
-function extractSequence(data) {
-  try {
-    // Find SEQ: marker in the data
-    const seqIndex = data.indexOf("SEQ:");
-    if (seqIndex === -1) return null;
-
-    // Extract sequence value
-    const seqStart = seqIndex + 4;
-    const seqEnd = data.indexOf(",", seqStart);
-    if (seqEnd === -1) return null;
-
-    return parseInt(data.substring(seqStart, seqEnd), 10);
-  } catch (e) {
-    return null;
-  }
-}
+// Sensor frames follow "DATA:" with a little-endian uint16 sequence and
+// uint16 payload length, then the raw quaternion payload
+const DATA_PREFIX_LENGTH = 5;
+const DATA_HEADER_LENGTH = 4;
+const MAX_DATA_PAYLOAD = 1024;
 
 // Configure port with optimal settings
 const port = new SerialPort({
@@ -217,39 +205,42 @@ port.on("data", (chunk) => {
     let dataStart;
 
     while ((dataStart = buffer.indexOf("DATA:", processedUpTo)) !== -1) {
-      const nextDataStart = buffer.indexOf("DATA:", dataStart + 5);
-
-      if (nextDataStart === -1) break; // Incomplete packet
-
-      // Extract packet and check sequence
-      const packet = buffer.slice(dataStart + 5, nextDataStart);
-      const packetStr = packet.toString();
-
-      // Extract sequence number if available
-      const seq = extractSequence(packetStr);
-      if (seq !== null) {
-        seqNumbers.push(seq);
-
-        // Check for packet loss or out-of-order delivery
-        if (lastSeq !== null) {
-          const expectedSeq = (lastSeq + 1) % 65536; // 16-bit rollover
-
-          if (seq !== expectedSeq) {
-            if (seq > expectedSeq) {
-              // Missing packets
-              const missing = (seq - expectedSeq) % 65536;
-              if (missing < 1000) {
-                // Sanity check
-                missedPackets += missing;
-              }
-            } else {
-              // Out of order packet
-              outOfOrderPackets++;
+      const headerEnd = dataStart + DATA_PREFIX_LENGTH + DATA_HEADER_LENGTH;
+      if (buffer.length < headerEnd) break; // Incomplete header
+
+      const payloadLength = buffer.readUInt16LE(headerEnd - 2);
+      if (payloadLength > MAX_DATA_PAYLOAD) {
+        // Not a real frame header, resync on the next marker
+        processedUpTo = dataStart + DATA_PREFIX_LENGTH;
+        continue;
+      }
+
+      const frameEnd = headerEnd + payloadLength;
+      if (buffer.length < frameEnd) break; // Incomplete packet
+
+      // Read sequence number from the frame header
+      const seq = buffer.readUInt16LE(dataStart + DATA_PREFIX_LENGTH);
+      seqNumbers.push(seq);
+
+      // Check for packet loss or out-of-order delivery
+      if (lastSeq !== null) {
+        const expectedSeq = (lastSeq + 1) % 65536; // 16-bit rollover
+
+        if (seq !== expectedSeq) {
+          if (seq > expectedSeq) {
+            // Missing packets
+            const missing = (seq - expectedSeq) % 65536;
+            if (missing < 1000) {
+              // Sanity check
+              missedPackets += missing;
             }
+          } else {
+            // Out of order packet
+            outOfOrderPackets++;
           }
         }
-        lastSeq = seq;
       }
+      lastSeq = seq;
 
       // Count this packet
       packetCount++;
@@ -267,7 +258,7 @@ port.on("data", (chunk) => {
       }
 
       // Move pointer
-      processedUpTo = nextDataStart;
+      processedUpTo = frameEnd;
     }
 
     // Keep only unprocessed data